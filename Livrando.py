@@ -34,6 +34,7 @@ Observações:
 """
 
 import os
+import atexit
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinter import ttk, messagebox
@@ -41,14 +42,27 @@ import requests
 import re
 import csv
 import sys
+import subprocess
 import json
 import time
 import queue
+import random
 import shutil
 import hashlib
+import mmap
+import zipfile
+import xml.etree.ElementTree as ET
 import unicodedata
 import string
 import threading
+import functools
+import operator
+import collections
+import copy
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 from PIL import Image
 from io import BytesIO
 from ebooklib import epub
@@ -73,49 +87,238 @@ KNOWN_AUTHORS = [
     'dan brown', 'george r.r. martin', 'j.r.r. tolkien', 'rick riordan',
     'Alexandra Sellers'
 ]
+# Formas pré-calculadas de KNOWN_AUTHORS (recalcular se a lista for alterada):
+# conjunto em minúsculas para comparação exata e uma alternação para saber,
+# numa única varredura, se algum autor conhecido aparece no texto
+_KNOWN_AUTHORS_LC = frozenset(a.lower() for a in KNOWN_AUTHORS)
+_KNOWN_AUTHORS_PAIRS = tuple((a, a.lower()) for a in KNOWN_AUTHORS)
+_KNOWN_AUTHORS_RE = re.compile('|'.join(re.escape(a) for a in sorted(_KNOWN_AUTHORS_LC, key=len, reverse=True)))
+
+# orjson (opcional) serializa o cache bem mais rápido que o json da stdlib
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    def _json_dumps(data):
+        return orjson.dumps(data).decode('utf-8')
+    _json_loads = orjson.loads
+else:
+    _json_dumps = json.dumps
+    _json_loads = json.loads
+
+# Escritas no cache são agrupadas e gravadas em uma única transação
+CACHE_BATCH_SIZE = 64
+CACHE_FLUSH_INTERVAL = 2.0  # segundos
+
+# Camada em memória (LRU) na frente do SQLite; entradas expiram após CACHE_TTL_DAYS
+CACHE_MEM_MAX = 4096
+CACHE_TTL_DAYS = 30
+CACHE_TTL_SECONDS = CACHE_TTL_DAYS * 86400
+# Respostas de API sem resultados valem menos tempo (o livro pode ser cadastrado)
+CACHE_EMPTY_TTL_SECONDS = 86400
+# Livro identificado por ISBN não muda: vale bem mais que as buscas por texto
+CACHE_ISBN_TTL_SECONDS = 365 * 86400
+
+_SQL_CACHE_SELECT = "SELECT data, created FROM cache WHERE query = ?"
+_SQL_CACHE_INSERT = "INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)"
+_SQL_CACHE_TOUCH = "UPDATE cache SET accessed = ? WHERE query = ?"
+
+# Conexão única compartilhada entre threads (protegida por _CACHE_LOCK)
+_CACHE_CONN = None
+_CACHE_LOCK = threading.RLock()
+_CACHE_PENDING = {}   # query -> linha aguardando gravação
+_CACHE_TOUCHED = {}   # query -> último acesso aguardando gravação
+_CACHE_MEM = collections.OrderedDict()  # query -> (data serializado, created em epoch)
+_cache_last_flush = time.monotonic()
 
 def init_cache():
     """Inicializa o banco de cache"""
-    conn = sqlite3.connect(CACHE_DB)
-    c = conn.cursor()
-    c.execute('''CREATE TABLE IF NOT EXISTS cache
+    global _CACHE_CONN
+    with _CACHE_LOCK:
+        if _CACHE_CONN is None:
+            _CACHE_CONN = sqlite3.connect(CACHE_DB, check_same_thread=False, isolation_level=None)
+            _CACHE_CONN.execute("PRAGMA journal_mode=WAL")
+            _CACHE_CONN.execute("PRAGMA synchronous=NORMAL")
+            _CACHE_CONN.execute("PRAGMA temp_store=MEMORY")
+            atexit.register(flush_cache)
+        _CACHE_CONN.execute('''CREATE TABLE IF NOT EXISTS cache
                  (query TEXT PRIMARY KEY, 
                   data TEXT,
                   created TIMESTAMP,
                   accessed TIMESTAMP)''')
-    conn.commit()
-    conn.close()
-
-def get_cached_data(query):
-    """Obtém dados do cache"""
+        _CACHE_CONN.execute("CREATE INDEX IF NOT EXISTS ix_accessed ON cache(accessed)")
+        # Datas são gravadas como epoch (REAL); converter linhas antigas em texto ISO
+        _CACHE_CONN.execute("""UPDATE cache
+                 SET created = CAST(strftime('%s', created, 'utc') AS REAL),
+                     accessed = CAST(strftime('%s', accessed, 'utc') AS REAL)
+                 WHERE typeof(created) = 'text'""")
+        # Respostas gravadas antes de a chave de API sair da chave do cache
+        _CACHE_CONN.execute("DELETE FROM cache WHERE query LIKE 'http:%?key=%' OR query LIKE 'http:%&key=%'")
+        # Hash de conteúdo por arquivo; válido enquanto tamanho e mtime não mudarem
+        _CACHE_CONN.execute('''CREATE TABLE IF NOT EXISTS file_hash
+                 (path TEXT PRIMARY KEY,
+                  size INTEGER,
+                  mtime REAL,
+                  hash TEXT)''')
+
+def _cache_db():
+    """Conexão do cache, aberta no primeiro uso e não na importação: os
+    processos de parsing importam o módulo mas nunca tocam no cache"""
+    if _CACHE_CONN is None:
+        init_cache()
+    return _CACHE_CONN
+
+def flush_cache():
+    """Grava em lote as escritas pendentes do cache"""
+    global _cache_last_flush
+    with _CACHE_LOCK:
+        _cache_last_flush = time.monotonic()
+        if not _CACHE_PENDING and not _CACHE_TOUCHED:
+            return
+        db = _cache_db()
+        rows = list(_CACHE_PENDING.values())
+        touched = [(accessed, query) for query, accessed in _CACHE_TOUCHED.items()]
+        _CACHE_PENDING.clear()
+        _CACHE_TOUCHED.clear()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany(_SQL_CACHE_INSERT, rows)
+            db.executemany(_SQL_CACHE_TOUCH, touched)
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"Erro ao gravar cache: {e}")
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+
+def _maybe_flush_cache():
+    """Dispara a gravação quando o lote enche ou o intervalo expira"""
+    if (len(_CACHE_PENDING) + len(_CACHE_TOUCHED) >= CACHE_BATCH_SIZE or
+            time.monotonic() - _cache_last_flush >= CACHE_FLUSH_INTERVAL):
+        flush_cache()
+
+def _cache_key(query):
+    """Normaliza a chave do cache"""
+    return str(query).strip().lower()
+
+def _cache_expired(created, now):
+    """Indica se uma entrada criada em `created` (epoch) já passou do TTL"""
+    return now - (created or 0.0) >= CACHE_TTL_SECONDS
+
+def _cache_mem_put(key, data, created):
+    """Insere na camada em memória descartando a entrada menos usada"""
+    _CACHE_MEM[key] = (data, created)
+    _CACHE_MEM.move_to_end(key)
+    if len(_CACHE_MEM) > CACHE_MEM_MAX:
+        _CACHE_MEM.popitem(last=False)
+
+def get_cached_data(query, in_memory=True):
+    """Obtém dados do cache (in_memory=False: sem passar pela camada em memória)"""
     try:
-        conn = sqlite3.connect(CACHE_DB)
-        c = conn.cursor()
-        c.execute("SELECT data FROM cache WHERE query = ?", (query,))
-        result = c.fetchone()
-        if result:
-            # Atualizar timestamp de acesso
-            c.execute("UPDATE cache SET accessed = ? WHERE query = ?", 
-                     (datetime.now(), query))
-            conn.commit()
-            return json.loads(result[0])
+        key = _cache_key(query)
+        with _CACHE_LOCK:
+            entry = _CACHE_MEM.get(key) if in_memory else None
+            if entry is not None:
+                _CACHE_MEM.move_to_end(key)
+            else:
+                pending = _CACHE_PENDING.get(key)
+                if pending:
+                    entry = (pending[1], pending[2])
+                else:
+                    entry = _cache_db().execute(_SQL_CACHE_SELECT, (key,)).fetchone()
+                if entry is None:
+                    return None
+                if in_memory:
+                    _cache_mem_put(key, *entry)
+            data, created = entry
+            now = time.time()
+            if _cache_expired(created, now):
+                _CACHE_MEM.pop(key, None)
+                return None
+            # Atualizar timestamp de acesso (gravado no próximo lote)
+            if key not in _CACHE_PENDING:
+                _CACHE_TOUCHED[key] = now
+                _maybe_flush_cache()
+        return _json_loads(data)
     except:
         pass
     return None
 
-def set_cached_data(query, data):
-    """Armazena dados no cache"""
+def set_cached_data(query, data, ttl=None, in_memory=True):
+    """Armazena dados no cache (por CACHE_TTL_SECONDS ou pelo `ttl` informado);
+    in_memory=False grava só no disco, sem ocupar a camada em memória"""
     try:
-        conn = sqlite3.connect(CACHE_DB)
-        c = conn.cursor()
-        c.execute("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
-                 (query, json.dumps(data), datetime.now(), datetime.now()))
-        conn.commit()
+        key = _cache_key(query)
+        serialized = _json_dumps(data)
+        now = time.time()
+        # Outro TTL: a entrada é gravada com `created` deslocado (para trás se
+        # menor, para frente se maior), de modo que expire após `ttl` sem
+        # precisar de outra coluna na tabela
+        created = now - (CACHE_TTL_SECONDS - ttl) if ttl else now
+        with _CACHE_LOCK:
+            if in_memory:
+                _cache_mem_put(key, serialized, created)
+            _CACHE_PENDING[key] = (key, serialized, created, now)
+            _CACHE_TOUCHED.pop(key, None)
+            _maybe_flush_cache()
     except:
         pass
 
-# Inicializar cache na inicialização do app
-init_cache()
+# Consultas em andamento: threads que pedem a mesma chave ao mesmo tempo
+# aguardam a primeira em vez de repetir a chamada de rede
+_INFLIGHT_LOCK = threading.Lock()
+_INFLIGHT: Dict[str, Future] = {}
+
+def single_flight(query, fn, *args):
+    """Executa fn(*args) uma única vez por chave entre consultas concorrentes"""
+    key = _cache_key(query)
+    with _INFLIGHT_LOCK:
+        fut = _INFLIGHT.get(key)
+        leader = fut is None
+        if leader:
+            fut = _INFLIGHT[key] = Future()
+    if not leader:
+        # Cópia: quem chama costuma anotar o dicionário retornado
+        return copy.deepcopy(fut.result())
+    try:
+        result = fn(*args)
+    except BaseException as e:
+        fut.set_exception(e)
+        raise
+    else:
+        fut.set_result(result)
+        return result
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+def get_cached_file_hash(path, size, mtime):
+    """Hash gravado para o arquivo, se tamanho e mtime ainda conferem"""
+    try:
+        with _CACHE_LOCK:
+            row = _cache_db().execute(
+                "SELECT hash FROM file_hash WHERE path = ? AND size = ? AND mtime = ?",
+                (path, size, mtime)).fetchone()
+        return row[0] if row else None
+    except sqlite3.Error:
+        return None
+
+def set_cached_file_hashes(rows):
+    """Grava em uma transação as linhas (path, size, mtime, hash)"""
+    if not rows:
+        return
+    with _CACHE_LOCK:
+        db = _cache_db()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            db.executemany("INSERT OR REPLACE INTO file_hash VALUES (?, ?, ?, ?)", rows)
+            db.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"Erro ao gravar hashes: {e}")
+            if db.in_transaction:
+                db.execute("ROLLBACK")
 
 # Configuração
 CONFIG_FILE = "livrando_config.ini"
@@ -141,8 +344,37 @@ try:
 except Exception:
     HAS_PDF = False
 
+# PDFium (opcional): leitura de metadados e texto em código nativo, bem mais
+# rápida que o parser em Python puro do PyPDF2
+try:
+    import pypdfium2 as pdfium  # type: ignore
+    HAS_PDFIUM = True
+except Exception:
+    HAS_PDFIUM = False
+# O PDFium não é thread-safe: toda chamada a ele passa por este lock (nos
+# processos de parsing não há disputa; no processo da interface, sim)
+_PDFIUM_LOCK = threading.RLock()
+
+# Páginas lidas na busca de ISBN: as primeiras e as últimas
+PDF_ISBN_FIRST_PAGES = 5
+PDF_ISBN_LAST_PAGES = 2
+# Tamanho máximo de PDF varrido por inteiro em pdf_may_have_text
+PDF_PRESCREEN_MAX_SIZE = 64 * 1024 * 1024
+
+# Hash de arquivos: acima deste tamanho o mmap é consumido em fatias
+HASH_MMAP_LIMIT = 64 * 1024 * 1024
+HASH_SLICE_SIZE = 16 * 1024 * 1024
+# Impressão digital rápida: início e fim do arquivo (antes do hash completo)
+HASH_PARTIAL_SIZE = 64 * 1024
+
 # Formatos suportados expandidos
-SUPPORTED_EXTS = {'.epub', '.pdf', '.mobi', '.azw3', '.djvu', '.fb2', '.txt', '.doc', '.docx', '.rtf', '.zip', '.rar', '.7z', '.exe'}
+SUPPORTED_EXTS = frozenset({'.epub', '.pdf', '.mobi', '.azw3', '.djvu', '.fb2', '.txt', '.doc', '.docx', '.rtf', '.zip', '.rar', '.7z', '.exe'})
+
+# Threads de identificação (padrão de [Geral] workers). Com o parsing de PDF
+# nos processos, as threads passam quase todo o tempo esperando a rede: o
+# número não depende dos núcleos, e a concorrência real por host continua
+# limitada por HOST_CONCURRENCY
+PIPELINE_WORKERS = 16
 
 # Configurações padrão
 DEFAULT_CONFIG = {
@@ -154,13 +386,15 @@ DEFAULT_CONFIG = {
         'covers_dirname': 'covers',
         'organize_mode': 'autor',
         'filename_pattern': '{author} - {title} ({year})',
-        'language': 'pt'
+        'language': 'pt',
+        'workers': str(PIPELINE_WORKERS)
     },
     'Opcoes': {
         'baixar_capas': 'True',
         'remover_acentos': 'True',
         'limpar_caracteres': 'True',
-        'ignorar_sem_metadados': 'False'
+        'ignorar_sem_metadados': 'False',
+        'detectar_duplicados': 'False'
     },
     'API': {
         'google_books_key': ''
@@ -173,6 +407,29 @@ DEFAULT_CONFIG = {
 
 # ------------------------------ Configuração ------------------------------
 
+# Texto já lido do INI: ((mtime_ns, tamanho), conteúdo). load_config é
+# chamada por arquivo processado; o disco só é lido de novo quando o arquivo muda
+_CONFIG_CACHE = None
+
+def _read_config_file():
+    """Conteúdo do INI ("" se não existe), relendo só quando o arquivo muda"""
+    global _CONFIG_CACHE
+    try:
+        st = os.stat(CONFIG_FILE)
+    except OSError:
+        return ""
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _CONFIG_CACHE
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    try:
+        with open(CONFIG_FILE, encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return ""
+    _CONFIG_CACHE = (key, text)
+    return text
+
 def load_config():
     """Carrega configuração do arquivo INI ou usa padrão"""
     config = configparser.ConfigParser()
@@ -183,20 +440,24 @@ def load_config():
         for key, value in options.items():
             config.set(section, key, value)
     
-    if os.path.exists(CONFIG_FILE):
-        config.read(CONFIG_FILE, encoding='utf-8')
+    # Cada chamada recebe um objeto próprio: quem altera e salva não afeta os outros
+    config.read_string(_read_config_file(), source=CONFIG_FILE)
     
     return config
 
 def save_config(config):
     """Salva configuração no arquivo INI"""
+    global _CONFIG_CACHE
     with open(CONFIG_FILE, 'w', encoding='utf-8') as configfile:
         config.write(configfile)
+    _CONFIG_CACHE = None
 
 def delete_config():
     """Exclui arquivo de configuração"""
+    global _CONFIG_CACHE
     if os.path.exists(CONFIG_FILE):
         os.remove(CONFIG_FILE)
+    _CONFIG_CACHE = None
 
 def get_config_value(config, section, key, default=None):
     """Obtém valor da configuração com fallback"""
@@ -206,48 +467,237 @@ def get_config_value(config, section, key, default=None):
         return default
 
 
-import time
+from urllib.parse import urlsplit, urlencode
 from requests.adapters import HTTPAdapter
 from requests.packages.urllib3.util.retry import Retry
 
-# Configurar retry automático
-session = requests.Session()
-retry_strategy = Retry(
-    total=3,
-    backoff_factor=1,
-    status_forcelist=[429, 500, 502, 503, 504],
-)
-session.mount("https://", HTTPAdapter(max_retries=retry_strategy))
+# Pool grande o bastante para o maior limite de HOST_CONCURRENCY, de modo que
+# as conexões keep-alive sejam reaproveitadas em vez de descartadas
+HTTP_POOL_MAXSIZE = 20
+# Hosts distintos com pool próprio guardado (APIs, capas, fallbacks)
+HTTP_POOL_CONNECTIONS = 16
+# Open Library pede um User-Agent identificável e é mais tolerante com ele
+# do que com o padrão genérico do requests
+HTTP_USER_AGENT = "Livrando/1.0 (organizador de livros)"
+
+_SESSION = None
+_SESSION_LOCK = threading.Lock()
+
+def http_session():
+    """Sessão HTTP compartilhada, montada no primeiro uso (não na importação)"""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            session = requests.Session()
+            # Configurar retry automático (429 é tratado por host em http_get)
+            retry_strategy = Retry(
+                total=3,
+                backoff_factor=1,
+                status_forcelist=[500, 502, 503, 504],
+            )
+            adapter = HTTPAdapter(max_retries=retry_strategy,
+                                  pool_connections=HTTP_POOL_CONNECTIONS,
+                                  pool_maxsize=HTTP_POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)  # miniaturas do Google Books vêm em http://
+            session.headers.update({"User-Agent": HTTP_USER_AGENT})
+            _SESSION = session
+        return _SESSION
+
+# Requisições simultâneas permitidas por host
+HOST_CONCURRENCY = {
+    'www.googleapis.com': 5,
+    'openlibrary.org': 10,
+    'covers.openlibrary.org': 20,
+}
+DEFAULT_HOST_CONCURRENCY = 4
+HTTP_429_RETRIES = 2
+HTTP_429_DEFAULT_WAIT = 2.0  # segundos, quando não há Retry-After
+HTTP_429_MAX_WAIT = 60.0
+# Espera cresce em dobro a cada 429 seguido, com um sorteio de até 25% a mais
+# para que as threads paradas no mesmo host não voltem todas juntas
+HTTP_429_JITTER = 0.25
+
+# Taxa máxima (requisições/segundo) por host; cai pela metade a cada 429 e
+# volta a subir aos poucos conforme as respostas chegam sem erro
+HOST_RATE_LIMITS = {
+    'www.googleapis.com': 5.0,
+    'openlibrary.org': 5.0,
+    'covers.openlibrary.org': 10.0,
+}
+DEFAULT_HOST_RATE = 5.0
+HOST_RATE_MIN = 0.2
+HOST_RATE_RECOVERY = 0.05  # fração da taxa máxima recuperada por resposta OK
+
+class HostBucket:
+    """Token bucket por host, ajustado pelas respostas do servidor"""
+
+    def __init__(self, rate):
+        self.max_rate = rate
+        self.rate = rate
+        self.tokens = rate
+        self.last = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Reserva um token, dormindo o necessário fora do lock"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            self.tokens -= 1
+            wait = max(self.blocked_until - now, 0.0)
+            if self.tokens < 0:
+                wait = max(wait, -self.tokens / self.rate)
+        if wait > 0:
+            time.sleep(wait)
+
+    def block(self, seconds):
+        """Pausa o host e reduz a taxa (429)"""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.rate = max(HOST_RATE_MIN, self.rate * 0.5)
+            self.tokens = min(self.tokens, 0.0)
+
+    def update(self, response):
+        """Recupera a taxa aos poucos e respeita X-RateLimit-* quando presentes"""
+        headers = response.headers
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * HOST_RATE_RECOVERY)
+            try:
+                remaining = int(headers['X-RateLimit-Remaining'])
+            except (KeyError, TypeError, ValueError):
+                return
+            self.tokens = min(self.tokens, float(remaining))
+            if remaining > 0:
+                return
+            try:
+                reset = float(headers.get('X-RateLimit-Reset', HTTP_429_DEFAULT_WAIT))
+            except (TypeError, ValueError):
+                reset = HTTP_429_DEFAULT_WAIT
+            # Alguns provedores mandam o instante (epoch) e outros os segundos restantes
+            if reset > 1e9:
+                reset -= time.time()
+            reset = min(max(reset, 0.0), HTTP_429_MAX_WAIT)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + reset)
+
+_HOST_LOCK = threading.Lock()
+_HOST_SEMAPHORES = {}
+_HOST_BUCKETS = {}
+
+def _host_semaphore(host):
+    """Retorna o semáforo que limita a concorrência para o host"""
+    with _HOST_LOCK:
+        sem = _HOST_SEMAPHORES.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, DEFAULT_HOST_CONCURRENCY))
+            _HOST_SEMAPHORES[host] = sem
+        return sem
+
+def _host_bucket(host):
+    """Retorna o token bucket do host"""
+    with _HOST_LOCK:
+        bucket = _HOST_BUCKETS.get(host)
+        if bucket is None:
+            bucket = HostBucket(HOST_RATE_LIMITS.get(host, DEFAULT_HOST_RATE))
+            _HOST_BUCKETS[host] = bucket
+        return bucket
+
+def _retry_after_seconds(response):
+    """Lê o cabeçalho Retry-After (em segundos) de uma resposta 429"""
+    try:
+        wait = float(response.headers.get('Retry-After', HTTP_429_DEFAULT_WAIT))
+    except (TypeError, ValueError):
+        wait = HTTP_429_DEFAULT_WAIT
+    return min(max(wait, 0.0), HTTP_429_MAX_WAIT)
+
+def http_get(url, **kwargs):
+    """GET com limite de concorrência e de taxa por host.
+
+    Um 429 pausa e desacelera apenas o host que respondeu; requisições a
+    outros hosts continuam normalmente.
+    """
+    host = urlsplit(url).hostname or ''
+    sem = _host_semaphore(host)
+    bucket = _host_bucket(host)
+    kwargs.setdefault('timeout', 15)
+    for attempt in range(HTTP_429_RETRIES + 1):
+        bucket.acquire()
+        with sem:
+            response = http_session().get(url, **kwargs)
+        if response.status_code != 429:
+            bucket.update(response)
+            return response
+        print(f"Rate limit atingido em {host}, aguardando...")
+        wait = _retry_after_seconds(response) * (2 ** attempt) * (1 + random.random() * HTTP_429_JITTER)
+        bucket.block(min(wait, HTTP_429_MAX_WAIT))
+    return response
+
+def http_get_json_cached(url, params=None, is_empty=None, **kwargs):
+    """GET de API JSON passando pelo cache persistente (chave = URL + parâmetros).
+
+    Só respostas 200 são guardadas, então erros e 429 são tentados de novo na
+    próxima vez; respostas sem resultados (is_empty) expiram em
+    CACHE_EMPTY_TTL_SECONDS. Devolve o JSON ou None.
+    """
+    key = _http_cache_key(url, params)
+    # Respostas brutas ficam só no disco: o resultado já ranqueado de cada
+    # busca é que ocupa a camada em memória
+    cached = get_cached_data(key, in_memory=False)
+    if cached is not None:
+        return cached
+    response = http_get(url, params=params, **kwargs)
+    if response.status_code != 200:
+        return None
+    data = response.json()
+    set_cached_data(key, data, CACHE_EMPTY_TTL_SECONDS if is_empty and is_empty(data) else None,
+                    in_memory=False)
+    return data
+
+# Parâmetros que não entram na chave do cache HTTP: a chave de API não deve
+# ficar gravada no banco, e trocá-la não muda as respostas
+_HTTP_CACHE_IGNORED_PARAMS = frozenset({'key'})
+
+def _http_cache_key(url, params=None):
+    """Chave do cache para a URL + parâmetros, sem a chave de API"""
+    parts = urlsplit(url)
+    if parts.query:
+        # Os demais parâmetros ficam como estão (sem recodificar): a chave é a
+        # mesma com ou sem chave de API, e as respostas já gravadas continuam valendo
+        query = '&'.join(p for p in parts.query.split('&')
+                         if p.partition('=')[0] not in _HTTP_CACHE_IGNORED_PARAMS)
+        url = parts._replace(query=query).geturl()
+    if params:
+        params = {k: v for k, v in params.items() if k not in _HTTP_CACHE_IGNORED_PARAMS}
+    return "http:" + url + ("?" + urlencode(params) if params else "")
+
+def _no_items(data):
+    return not data.get("items")
+
+def _no_docs(data):
+    return not data.get("docs")
 
 def buscar_com_rate_limit(titulo, autor, api_key=None):
-    """Busca com controle de rate limiting"""
-    # Esperar entre requests para evitar limite
-    time.sleep(0.5)  # 500ms entre requests
-    
-    try:
-        return buscar_google_books(titulo, autor, api_key)
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 429:
-            print("Rate limit atingido, aguardando...")
-            time.sleep(2)  # Esperar mais se atingiu limite
-            return None
-        raise
+    """Busca com controle de rate limiting (feito por host em http_get)"""
+    return buscar_google_books(titulo, autor, api_key)
         
 def show_api_stats(self):
     """Mostra estatísticas de uso das APIs"""
     try:
-        conn = sqlite3.connect(CACHE_DB)
-        c = conn.cursor()
-        
-        # Contar requests por fonte
-        c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%Google Books%'")
-        google_count = c.fetchone()[0]
-        
-        c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%Open Library%'")
-        ol_count = c.fetchone()[0]
-        
-        c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%ISBNdb%'")
-        isbndb_count = c.fetchone()[0]
+        flush_cache()
+        with _CACHE_LOCK:
+            c = _cache_db().cursor()
+            
+            # Contar requests por fonte
+            c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%Google Books%'")
+            google_count = c.fetchone()[0]
+            
+            c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%Open Library%'")
+            ol_count = c.fetchone()[0]
+            
+            c.execute("SELECT COUNT(*) FROM cache WHERE data LIKE '%ISBNdb%'")
+            isbndb_count = c.fetchone()[0]
         
         self.log_line(f"=== ESTATÍSTICAS API ===", "info")
         self.log_line(f"Google Books: {google_count} requests", "info")
@@ -257,6 +707,19 @@ def show_api_stats(self):
         
     except:
         self.log_line("Estatísticas não disponíveis", "warning")
+
+# Pools de threads de longa duração, criados no primeiro uso (não na importação)
+_SHARED_POOLS: Dict[str, ThreadPoolExecutor] = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+def shared_thread_pool(nome, workers):
+    """Pool de threads compartilhado identificado por `nome`"""
+    with _SHARED_POOLS_LOCK:
+        pool = _SHARED_POOLS.get(nome)
+        if pool is None:
+            pool = _SHARED_POOLS[nome] = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=nome)
+        return pool
+
 # ------------------------------ Teste de Conexão ------------------------------
 
 def test_internet_connection():
@@ -274,7 +737,7 @@ def test_google_books_api(api_key=None):
         params = {"q": "python", "maxResults": 1}
         if api_key:
             params["key"] = api_key
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=10)
         return response.status_code == 200, f"Google Books: {'Com chave' if api_key else 'Sem chave'} - Status: {response.status_code}"
     except Exception as e:
         return False, f"Google Books: Erro - {str(e)}"
@@ -284,20 +747,204 @@ def test_open_library():
     try:
         url = "https://openlibrary.org/search.json"
         params = {"q": "python", "limit": 1}
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=10)
         return response.status_code == 200, f"Open Library: Status: {response.status_code}"
     except Exception as e:
         return False, f"Open Library: Erro - {str(e)}"
 
+# ------------------------------ Padrões de texto ------------------------------
+# Expressões regulares compiladas uma única vez na importação; as funções de
+# limpeza são chamadas várias vezes por arquivo e não devem recompilá-las.
+
+_WS_RE = re.compile(r'\s+')
+_BRACKET_NUM_RE = re.compile(r'\[\d+\]')
+_PLUS_UND_MULTI_RE = re.compile(r'[+_]{2,}')
+_PLUS_UND_RE = re.compile(r'[+_]')
+_UND_PLUS_RUN_RE = re.compile(r'[_+]+')
+_DOT_MULTI_RE = re.compile(r'\.{2,}')
+# Espaços "invisíveis" -> espaço e traços unicode -> hífen ASCII, num único translate
+# (espaços especiais e traços de compatibilidade já saem da NFKC como ' ' e '-')
+_UND_PLUS_TABLE = str.maketrans('_+', '  ')  # espaços repetidos são unidos depois
+_DASH_TABLE = str.maketrans({cp: '-' for cp in (0x2012, 0x2013, 0x2014, 0x2212, 0x2043)})
+# Pontos que não fazem parte de abreviações ("J. K. Rowling" é preservado)
+_LOOSE_DOT_RE = re.compile(r'(?<!\b[A-Z])\.(?![A-Z]\b)')
+_EXT_RE = re.compile(r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$', re.IGNORECASE)
+_INNER_DASH_RE = re.compile(r'(?<=\w)-(?=\w)')
+_LEAD_DASH_RE = re.compile(r'^\s*-+\s*')
+_TRAIL_DASH_RE = re.compile(r'\s*-+\s*$')
+_NUM_MID_RE = re.compile(r'\s\d+\s')
+_NUM_LEAD_RE = re.compile(r'^\d+\s')
+_NUM_TAIL_RE = re.compile(r'\s\d+$')
+_ISOLATED_NUM_RE = re.compile(r'\b\d+\b')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+_NON_WORD_ACCENT_RE = re.compile(r'[^\w\sáéíóúàèìòùâêîôûãõäëïöüçÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÄËÏÖÜÇ]')
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s\-\(\)\.]')
+_MULTI_DASH_UND_RE = re.compile(r"[-_]{2,}")
+_YEAR4_PREFIX_RE = re.compile(r"(\d{4})")
+_TOKEN_RE = re.compile(r"\w+")
+_PAREN_RE = re.compile(r'\(.*?\)')
+_ALL_DIGITS_RE = re.compile(r'^\d+$')
+_ALL_UPPER_RE = re.compile(r'^[A-Z\s]+$')
+_NO_LETTERS_RE = re.compile(r'^[\d\W]+$')
+_UNKNOWN_NAME_CHARS_RE = re.compile(r'[^\w\s\-\.]')
+
+# Padrões de data (extract_year_from_date), em ordem de preferência
+_DATE_YEAR_RES = (
+    re.compile(r'(\d{4})'),              # Apenas ano (1999)
+    re.compile(r'(\d{4})-\d{2}-\d{2}'),   # ISO (1999-12-31)
+    re.compile(r'\d{2}/(\d{4})'),         # MM/YYYY
+    re.compile(r'\d{2}-\d{2}-(\d{4})'),   # DD-MM-YYYY
+)
+
+# Lixo removido de nomes de arquivos não identificados
+_UNKNOWN_JUNK_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'reidoebook\[?\d*\]?\.com[+-]*',
+    r'www\.\w+\.com',
+    r'z-library',
+    r'\(z-library\)',
+    r'pdfcoffee\.com',
+    r'\(.*?\)',
+    r'\[.*?\]',
+    r'\d{4}',
+))
+
+# Lixo removido por clean_search_query
+# (tags como "(z-library)" e "[1]" caem nos padrões genéricos de parênteses e colchetes)
+_QUERY_JUNK_PATTERNS = (
+    r'\bmicrosoft\s+word\b',  # Remove "Microsoft Word" como frase
+    r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar|doc)$',
+    r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
+    r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b',
+    r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
+)
+
+# Lixo digital removido por clean_search_query_metadados
+_METADATA_JUNK_PATTERNS = (
+    r'\bmicrosoft\s+word\b',  # Remove "Microsoft Word" como frase
+    r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$',
+    r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
+    r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b', r'\b\d+k\b',
+    r'reidoebook', r'livrosparatodos', r'z-lib', r'pdf-free',
+    r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
+)
+
+# Lixo removido por clean_search_query_nome_arquivo
+_FILENAME_JUNK_PATTERNS = (
+    r'\bmicrosoft\s+word\b',  # Remove "Microsoft Word" como frase
+    r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$',
+    r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
+    r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b', r'\b\d+k\b',
+    r'reidoebook', r'livrosparatodos', r'z-lib', r'pdf-free',
+    r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
+)
+
+def _compile_all(patterns):
+    """Compila os padrões (sem repetidos, na ordem) sem diferenciar maiúsculas"""
+    return tuple(re.compile(p, re.IGNORECASE) for p in dict.fromkeys(patterns))
+
+def _sub_all(regexes, text):
+    """Remove cada padrão do texto, um após o outro"""
+    for rx in regexes:
+        text = rx.sub('', text)
+    return text
+
+# Aplicados em sequência, não numa alternação única: remover um padrão pode formar outro
+_QUERY_JUNK_RES = _compile_all(_QUERY_JUNK_PATTERNS)
+_METADATA_JUNK_RES = _compile_all(_METADATA_JUNK_PATTERNS)
+_FILENAME_JUNK_RES = _compile_all(_FILENAME_JUNK_PATTERNS)
+
+# Prefixos irrelevantes no início do nome
+_IRRELEVANT_PREFIXES = (
+    'pdfcoffee', 'livrosparatodos', 'reidoebook', 'docero', 'zlibrary', 'libgen',
+    'ebooksgratis', 'baixarlivros', 'downloadlivros', 'freebook', 'biblioteca'
+)
+_IRRELEVANT_PREFIX_RES = tuple(re.compile(rf'^{prefix}\s+', re.IGNORECASE) for prefix in _IRRELEVANT_PREFIXES)
+
+# "documento de texto" e variações
+_DOC_PATTERNS = (
+    r'novo\s*(?:documento|arquivo|file)',
+    r'novo\s*(?:doc|txt|texto)',
+    r'documento\s*(?:de\s*texto|sem\s*título)',
+    r'untitled', r'sem título'
+)
+_DOC_RES = _compile_all(_DOC_PATTERNS)
+
+# Padrões comuns de nomes de arquivos de livros (extract_title_author_from_filename)
+# (a ordem título/autor é decidida depois pelas heurísticas, então
+# "Título - Autor" e "Autor - Título" compartilham o mesmo padrão)
+_TITLE_AUTHOR_PATTERNS = (
+    # 1. Título - Autor (Ano) / Autor - Título (Ano)
+    r'^(.*?)\s*[-–—]\s*(.*?)\s*[\(\[]\d{4}[\)\]]',
+    # 2. Título (Ano) - Autor / Autor (Ano) - Título
+    r'^(.*?)\s*[\(\[](\d{4})[\)\]]\s*[-–—]\s*(.*?)$',
+    # 3. Título - Autor / Autor - Título
+    r'^(.*?)\s*[-–—]\s*(.*?)$',
+    # 4. Título por Autor
+    r'^(.*?)\s+(?:por|by)\s+(.*?)$',
+    # 5. Autor: Título
+    r'^(.*?)\s*:\s*(.*?)$',
+    # 6. Título, Autor
+    r'^(.*?)\s*,\s*(.*?)$',
+)
+_TITLE_AUTHOR_RES = tuple(re.compile(p, re.IGNORECASE) for p in _TITLE_AUTHOR_PATTERNS)
+# Alternação única na mesma ordem: o re tenta as alternativas em sequência,
+# então a primeira que casa é a mesma que o laço padrão a padrão acharia
+_TITLE_AUTHOR_RE = re.compile('|'.join(f'(?:{p})' for p in _TITLE_AUTHOR_PATTERNS), re.IGNORECASE)
+# Todo padrão exige um destes separadores; sem eles nenhum pode casar
+_TITLE_AUTHOR_HINT_RE = re.compile(r'[-–—:,]|\s(?:por|by)\s', re.IGNORECASE)
+
+# Título (Autor) / Título [Autor]
+_PAREN_AUTHOR_RES = (
+    re.compile(r'^(.+?)\s*[\(\[](.+?)[\)\]]', re.IGNORECASE),
+)
+
+# Padrões de ano: (1999), [1999], 1999, - 1999, etc.
+_YEAR_RES = (
+    re.compile(r'[\(\[](\d{4})[\)\]]'),  # (1999) ou [1999]
+    re.compile(r'\b(\d{4})\b'),           # 1999 (standalone)
+    re.compile(r'[-–—](\d{4})[-–—]'),     # -1999-
+    re.compile(r'\s(\d{4})\s'),           # espaço1999espaço
+)
+# Limite superior para anos plausíveis (ano atual + 1), fixado na inicialização
+_CURRENT_YEAR = datetime.now().year
+
+# Heurísticas de looks_like_author
+_AUTHOR_JUNK_WORDS = ('reidoebook', 'com', 'net', 'org', 'pdf', 'epub', 'documento', 'texto')
+_COMMON_SURNAMES = ('king', 'brown', 'coelho', 'rowling', 'martin', 'tolkien', 
+                    'riordan', 'crichton', 'assis', 'lispector', 'amado', 'verissimo',
+                    'cury', 'green', 'sparks', 'sheldon', 'follett', 'koontz')
+_STOPWORDS = frozenset(('the', 'and', 'or', 'of', 'de', 'da', 'do', 'das', 'dos', 'a', 'o', 'as', 'os'))
+# Buscas por substring fundidas numa única varredura
+_AUTHOR_JUNK_RE = re.compile('|'.join(map(re.escape, _AUTHOR_JUNK_WORDS)))
+_COMMON_SURNAMES_RE = re.compile('|'.join(map(re.escape, _COMMON_SURNAMES)))
+_SHORT_WORDS = frozenset(('a', 'o', 'as', 'os', 'um', 'uma'))
+
+# Lixo em título/autor (validate_metadata e is_high_quality_local_metadata),
+# procurado como substring numa única varredura
+_INVALID_TITLE_RE = re.compile('|'.join(map(re.escape, (
+    'unknown', 'untitled', 'document', 'file', 'microsoft', 'word'))))
+_INVALID_AUTHOR_RE = re.compile('|'.join(map(re.escape, (
+    'unknown', 'anonymous', 'author', 'user', 'admin', 'system', 't_ms02'))))
+_LOCAL_JUNK_TITLE_RE = re.compile('unknown|untitled|document')
+_LOCAL_JUNK_AUTHOR_RE = re.compile('unknown|anonymous|user|admin')
+
+# Caracteres inválidos em nomes de arquivo
+# (caracteres de controle ASCII são removidos no mesmo passo)
+_INVALID_FILENAME_TABLE = str.maketrans({
+    **{chr(c): None for c in list(range(32)) + [127]},
+    **{c: '-' for c in '<>:"/\\|?*\n\r\t'},
+})
+_FILENAME_ACCENTS = 'áéíóúàèìòùâêîôûãõäëïöüçÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛãõÄËÏÖÜÇ'
+
 # ------------------------------ Utilidades ------------------------------
 
 def buscar_url_capa(titulo, autor):
     """Busca URL da capa do livro"""
     try:
         query = f"{titulo} {autor}" if autor else titulo
-        url = f"https://www.googleapis.com/books/v1/volumes?q={query}&maxResults=1"
+        url = "https://www.googleapis.com/books/v1/volumes"
         
-        response = requests.get(url, timeout=10)
+        response = http_get(url, params={"q": query, "maxResults": 1}, timeout=10)
         if response.status_code == 200:
             data = response.json()
             if "items" in data and len(data["items"]) > 0:
@@ -308,36 +955,27 @@ def buscar_url_capa(titulo, autor):
         pass
     return None
 
+@functools.lru_cache(maxsize=8192)
 def clean_search_query(text):
     """Limpa completamente a query de busca"""
     if not text:
         return ""
     
     # Remover completamente lixo digital
-    junk_patterns = [
-        r'\(z-library\)', r'\(z-lib\)', r'\(libgen\)', r'\(pdf\)', r'\(epub\)', 
-        r'\bmicrosoft\s+word\b',  # Remove "Microsoft Word" como frase
-        r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar|doc)$',
-        r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
-        r'\[1\]', r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b',
-        r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
-    ]
-    
-    for pattern in junk_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _sub_all(_QUERY_JUNK_RES, text)
     
     # Substituir caracteres especiais por espaços
     #text = re.sub(r'[_-]', ' ', text)
     
     # Remover números isolados e caracteres especiais
-    text = re.sub(r'\b\d+\b', ' ', text)
-    text = re.sub(r'[^\w\s]', ' ', text)
+    text = _ISOLATED_NUM_RE.sub(' ', text)
+    text = _NON_WORD_RE.sub(' ', text)
     
     # Manter acentos e caracteres especiais (importantes para nomes)
-    text = re.sub(r'[^\w\sáéíóúàèìòùâêîôûãõäëïöüçÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛÃÕÄËÏÖÜÇ]', '', text)
+    text = _NON_WORD_ACCENT_RE.sub('', text)
     
     # Normalizar espaços
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     
     return text
     
@@ -361,27 +999,31 @@ def construct_search_query(local_meta, filename):
     
     return ' '.join(query_bits) if query_bits else ""
 
+def _api_responde(url):
+    """Indica se a URL responde com status 200"""
+    try:
+        return http_get(url, timeout=10).status_code == 200
+    except Exception:
+        return False
+
 def test_api_connection():
     """Testa se as APIs estão respondendo"""
-    try:
-        # Testar Google Books
-        google_url = "https://www.googleapis.com/books/v1/volumes?q=python&maxResults=1"
-        google_response = requests.get(google_url, timeout=10)
-        google_ok = google_response.status_code == 200
-        
-        # Testar Open Library
-        ol_url = "https://openlibrary.org/search.json?q=python&limit=1"
-        ol_response = requests.get(ol_url, timeout=10)
-        ol_ok = ol_response.status_code == 200
-        
-        return google_ok, ol_ok
-    except:
-        return False, False
+    # As duas consultas rodam em paralelo
+    urls = (
+        "https://www.googleapis.com/books/v1/volumes?q=python&maxResults=1",  # Google Books
+        "https://openlibrary.org/search.json?q=python&limit=1",              # Open Library
+    )
+    with ThreadPoolExecutor(max_workers=len(urls)) as pool:
+        google_ok, ol_ok = pool.map(_api_responde, urls)
+    return google_ok, ol_ok
 
+@functools.lru_cache(maxsize=8192)
 def remover_acentos(texto):
     """Remove acentos do texto mantendo caracteres especiais"""
     if not texto:
         return ""
+    if texto.isascii():
+        return texto  # nada a decompor
     texto = unicodedata.normalize('NFD', texto)
     texto = ''.join(c for c in texto if unicodedata.category(c) != 'Mn')
     return texto
@@ -390,21 +1032,50 @@ def limpar_caracteres_especiais(texto):
     """Remove caracteres especiais mantendo letras, números e espaços"""
     if not texto:
         return ""
-    texto = re.sub(r'[^\w\s\-\(\)\.]', '', texto)
-    texto = re.sub(r'\s+', ' ', texto)
+    texto = _SPECIAL_CHARS_RE.sub('', texto)
+    texto = _WS_RE.sub(' ', texto)
     return texto.strip()
 
 def calcular_hash(caminho):
-    """Calcula hash MD5 do arquivo"""
-    md5 = hashlib.md5()
+    """Calcula chave de deduplicação do arquivo no formato "<tamanho>-<blake2b>"."""
     try:
         with open(caminho, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                md5.update(chunk)
-        return md5.hexdigest()
+            tamanho = os.fstat(f.fileno()).st_size
+            h = hashlib.blake2b(digest_size=16)
+            if tamanho:
+                # mmap evita o laço de leituras em Python; arquivos grandes são
+                # alimentados em fatias para não provocar picos de page faults
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if tamanho <= HASH_MMAP_LIMIT:
+                        h.update(mm)
+                    else:
+                        view = memoryview(mm)
+                        try:
+                            for inicio in range(0, tamanho, HASH_SLICE_SIZE):
+                                h.update(view[inicio:inicio + HASH_SLICE_SIZE])
+                        finally:
+                            view.release()
+        return f"{tamanho}-{h.hexdigest()}"
     except:
         return None
 
+def calcular_hash_parcial(caminho, tamanho):
+    """Chave barata "<tamanho>-<blake2b>" dos primeiros e últimos HASH_PARTIAL_SIZE bytes.
+
+    Para arquivos de até 2 * HASH_PARTIAL_SIZE cobre o conteúdo inteiro.
+    """
+    try:
+        with open(caminho, 'rb') as f:
+            if tamanho <= 2 * HASH_PARTIAL_SIZE:
+                data = f.read()
+            else:
+                data = f.read(HASH_PARTIAL_SIZE)
+                f.seek(-HASH_PARTIAL_SIZE, os.SEEK_END)
+                data += f.read(HASH_PARTIAL_SIZE)
+        return f"{tamanho}-{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+    except OSError:
+        return None
+
 def normalizar_texto(texto, remover_acentos_flag=True, limpar_caracteres_flag=True):
     """Normaliza texto com opções de limpeza"""
     if not texto:
@@ -418,59 +1089,115 @@ def normalizar_texto(texto, remover_acentos_flag=True, limpar_caracteres_flag=Tr
     
     return texto.strip()
 
-def gerar_hash_md5(filepath):
-    """Gera hash MD5 do arquivo"""
-    try:
-        with open(filepath, 'rb') as f:
-            return hashlib.md5(f.read()).hexdigest()
-    except:
-        return None
-
 def truncar_nome(nome, limite=200):
     """Trunca nome se muito longo"""
     return nome[:limite] if len(nome) > limite else nome
 
+@functools.lru_cache(maxsize=4096)
 def normalize_spaces(s: str) -> str:
     """Normaliza espaços em branco"""
-    return re.sub(r"\s+", " ", s).strip()
+    return _WS_RE.sub(" ", s).strip()
 
+@functools.lru_cache(maxsize=2048)
 def sanitize_filename(name: str, max_len: int = 180) -> str:
     """Remove caracteres inválidos para nome de arquivo e limita tamanho."""
     name = normalize_spaces(name)
-    invalid = '<>:"/\\|?*\n\r\t'
-    table = str.maketrans({c: '-' for c in invalid})
-    name = name.translate(table)
-    name = ''.join(ch for ch in name if ch.isprintable() or ch in 'áéíóúàèìòùâêîôûãõäëïöüçÁÉÍÓÚÀÈÌÒÙÂÊÎÔÛãõÄËÏÖÜÇ')
-    name = re.sub(r"[-_]{2,}", "-", name)
+    name = name.translate(_INVALID_FILENAME_TABLE)
+    # Filtro caractere a caractere só quando sobrou algo não imprimível (raro)
+    if not name.isprintable():
+        name = ''.join(ch for ch in name if ch.isprintable() or ch in _FILENAME_ACCENTS)
+    name = _MULTI_DASH_UND_RE.sub("-", name)
     return name[:max_len].rstrip('. ')
 
+@functools.lru_cache(maxsize=2048)
 def year_from_date_str(date_str: Optional[str]) -> Optional[str]:
     """Extrai ano de string de data"""
     if not date_str:
         return None
-    m = re.match(r"(\d{4})", date_str)
+    m = _YEAR4_PREFIX_RE.match(date_str)
     return m.group(1) if m else None
 
+@functools.lru_cache(maxsize=16384)
+def token_set(text: str) -> frozenset:
+    """Conjunto de tokens (minúsculos) do texto; memoizado entre comparações"""
+    return frozenset(_TOKEN_RE.findall(text.lower()))
+
+@functools.lru_cache(maxsize=8192)
 def token_score(a: str, b: str) -> float:
     """Pontuação simples de similaridade por interseção de tokens (0..1)."""
     if not a or not b:
         return 0.0
-    at = set(re.findall(r"\w+", a.lower()))
-    bt = set(re.findall(r"\w+", b.lower()))
-    if not at or not bt:
+    return token_score_pre(token_set(a), b)
+
+def token_score_pre(at: frozenset, b: str) -> float:
+    """token_score com o lado `a` já tokenizado (token_set), para comparar a
+    mesma consulta com vários candidatos sem refazer a tokenização"""
+    if not at or not b:
+        return 0.0
+    bt = token_set(b)
+    if not bt:
         return 0.0
     inter = len(at & bt)
-    uni = len(at | bt)
-    return inter / max(1, uni)
+    # |A ∪ B| = |A| + |B| - |A ∩ B|, sem montar o conjunto união
+    return inter / (len(at) + len(bt) - inter)
+
+@functools.lru_cache(maxsize=16384)
+def trigram_set(text: str) -> frozenset:
+    """Trigramas de caracteres do texto normalizado (minúsculas, espaços simples)"""
+    text = f" {normalize_spaces(text.lower())} "
+    return frozenset(text[i:i + 3] for i in range(len(text) - 2))
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Jaccard dos trigramas de caracteres (0..1); desempata candidatos com o
+    mesmo token_score, favorecendo o título de tamanho e grafia mais próximos"""
+    if not a or not b:
+        return 0.0
+    at = trigram_set(a)
+    bt = trigram_set(b)
+    inter = len(at & bt)
+    return inter / (len(at) + len(bt) - inter)
+
+def best_author_score(autor_tokens: frozenset, authors) -> float:
+    """Maior token_score_pre entre o autor procurado e os autores do candidato"""
+    best = 0.0
+    for auth in authors:
+        score = token_score_pre(autor_tokens, auth)
+        if score > best:
+            best = score
+    return best
+
+def _title_author_groups(match):
+    """Grupos não numéricos do match (ignora ano quando existir)"""
+    return [g.strip() for g in match.groups() if g and not g.isdigit()]
+
+def _match_title_author(filename):
+    """Primeiro padrão de _TITLE_AUTHOR_PATTERNS que rende duas partes"""
+    if not _TITLE_AUTHOR_HINT_RE.search(filename):
+        return None
+    match = _TITLE_AUTHOR_RE.match(filename)
+    if match is None:
+        return None
+    groups = _title_author_groups(match)
+    if len(groups) >= 2:
+        return groups[0], groups[1]
+    # Raro: o primeiro padrão casou sem duas partes; seguir padrão a padrão
+    for rx in _TITLE_AUTHOR_RES:
+        match = rx.match(filename)
+        if match:
+            groups = _title_author_groups(match)
+            if len(groups) >= 2:
+                return groups[0], groups[1]
+    return None
+
 def extract_title_author_from_filename(filename):
     """Extrai título e autor do nome do arquivo considerando padrões comuns"""
     
     # Primeiro, verificar se há correspondência exata com autores conhecidos
-    for author in KNOWN_AUTHORS:
-        if author.lower() in filename.lower():
+    filename_lower = filename.lower()
+    known_authors = _KNOWN_AUTHORS_PAIRS if _KNOWN_AUTHORS_RE.search(filename_lower) else ()
+    for author, author_lower in known_authors:
+        if author_lower in filename_lower:
             # Extrair o título baseado na posição do autor
-            author_lower = author.lower()
-            filename_lower = filename.lower()
             author_start = filename_lower.find(author_lower)
             
             # Se o autor está no início
@@ -493,74 +1220,52 @@ def extract_title_author_from_filename(filename):
                         return title, author
     
     # Padrões comuns de nomes de arquivos de livros
-    patterns = [
-        # 1. Título - Autor (Ano)
-        r'^(.*?)\s*[-–—]\s*(.*?)\s*[\(\[]\d{4}[\)\]]',
-        # 2. Autor - Título (Ano)
-        r'^(.*?)\s*[-–—]\s*(.*?)\s*[\(\[]\d{4}[\)\]]',
-        # 3. Título (Ano) - Autor
-        r'^(.*?)\s*[\(\[](\d{4})[\)\]]\s*[-–—]\s*(.*?)$',
-        # 4. Autor (Ano) - Título
-        r'^(.*?)\s*[\(\[](\d{4})[\)\]]\s*[-–—]\s*(.*?)$',
-        # 5. Título - Autor
-        r'^(.*?)\s*[-–—]\s*(.*?)$',
-        # 6. Autor - Título
-        r'^(.*?)\s*[-–—]\s*(.*?)$',
-        # 7. Título por Autor
-        r'^(.*?)\s+(?:por|by)\s+(.*?)$',
-        # 8. Autor: Título
-        r'^(.*?)\s*:\s*(.*?)$',
-        # 9. Título, Autor
-        r'^(.*?)\s*,\s*(.*?)$',
-    ]
-    
-    for pattern in patterns:
-        match = re.match(pattern, filename, re.IGNORECASE)
-        if match:
-            # Pega os grupos não numéricos (ignora ano quando existir)
-            groups = [g.strip() for g in match.groups() if g and not g.isdigit()]
-            if len(groups) < 2:
-                continue
-            
-            part1, part2 = groups[0], groups[1]
-            
-            # Verificar se alguma parte é um autor conhecido exato
-            if part1.lower() in KNOWN_AUTHORS and looks_like_title(part2):
-                return part2, part1  # Título, Autor
-            elif part2.lower() in KNOWN_AUTHORS and looks_like_title(part1):
-                return part1, part2  # Título, Autor
-            
-            # Determinar qual parte é título e qual é autor usando heurística
-            if looks_like_author(part1) and looks_like_title(part2):
-                return part2, part1  # Título, Autor
-            elif looks_like_title(part1) and looks_like_author(part2):
-                return part1, part2  # Título, Autor
-            else:
-                # Por padrão, assume part1 = título e part2 = autor
-                return part1, part2
+    parts = _match_title_author(filename)
+    if parts:
+        part1, part2 = parts
+        
+        # Verificar se alguma parte é um autor conhecido exato
+        if part1.lower() in _KNOWN_AUTHORS_LC and looks_like_title(part2):
+            return part2, part1  # Título, Autor
+        elif part2.lower() in _KNOWN_AUTHORS_LC and looks_like_title(part1):
+            return part1, part2  # Título, Autor
+        
+        # Determinar qual parte é título e qual é autor usando heurística
+        if looks_like_author(part1) and looks_like_title(part2):
+            return part2, part1  # Título, Autor
+        elif looks_like_title(part1) and looks_like_author(part2):
+            return part1, part2  # Título, Autor
+        else:
+            # Por padrão, assume part1 = título e part2 = autor
+            return part1, part2
     
     # Se não encontrou padrão, retornar o nome completo como título
     return filename, None
 
 def extract_metadata_from_filename(filename):
     """Extrai metadados do nome do arquivo de forma inteligente"""
+    # Cópia do resultado memoizado: quem chama pode alterar o dicionário
+    meta = dict(_extract_metadata_from_filename(filename))
+    if meta.get('authors'):
+        meta['authors'] = list(meta['authors'])
+    return meta
+
+# Memoizado: Recarregar e "extrair todos" repetem os mesmos nomes de arquivo
+@functools.lru_cache(maxsize=4096)
+def _extract_metadata_from_filename(filename):
     
     # Extrair ano primeiro
     year = extract_year_from_filename(filename)
     
     # 1. PRIMEIRO: Fazer uma limpeza BÁSICA para análise inicial
-    name_basic_clean = re.sub(r'\[\d+\]', '', filename)  # Remover [1], [2]
-    name_basic_clean = re.sub(r'[+_]{2,}', ' ', name_basic_clean)
-    name_basic_clean = re.sub(r'\s+', ' ', name_basic_clean).strip()
+    name_basic_clean = _BRACKET_NUM_RE.sub('', filename)  # Remover [1], [2]
+    name_basic_clean = _PLUS_UND_MULTI_RE.sub(' ', name_basic_clean)
+    name_basic_clean = _WS_RE.sub(' ', name_basic_clean).strip()
     
     # 2. Tentar padrões com parênteses PRIMEIRO (mais confiáveis)
-    paren_patterns = [
-        r'^(.+?)\s*[\(\[](.+?)[\)\]]',  # Título (Autor)
-    ]
-    
-    for pattern in paren_patterns:
+    for rx in _PAREN_AUTHOR_RES:
         try:
-            match = re.match(pattern, name_basic_clean, re.IGNORECASE)
+            match = rx.match(name_basic_clean)
             if match:
                 groups = [g.strip() for g in match.groups() if g and g.strip()]
                 if len(groups) >= 2 and looks_like_title(groups[0]) and looks_like_author(groups[1]):
@@ -635,73 +1340,74 @@ def extract_metadata_from_filename(filename):
     return {'title': name_clean, 'authors': None, 'publishedDate': year}
     
    
+# Memoizado: os mesmos trechos se repetem entre muitos nomes de arquivo
+@functools.lru_cache(maxsize=8192)
 def looks_like_author(text: str) -> bool:
     """Verifica se o texto parece ser um nome de autor"""
-    if not text or len(text) < 3:
+    if not text:
         return False
     
     text = text.strip()
-    words = text.split()
-    score = 0
     
-    # Não pode ser muito curto ou conter apenas números
-    if len(text) < 2 or text.isdigit():
+    # Não pode ser uma única letra, muito curto ou conter apenas números
+    if len(text) <= 2 or text.isdigit() or text in _SHORT_WORDS:
         return False
     
-    # 0. REGRA NOVA: Não pode ser uma única letra ou número
-    if len(text) <= 2 or text.isdigit() or text in ['a', 'o', 'as', 'os', 'um', 'uma']:
-        return False
+    lower = text.lower()
     
     # Não pode conter palavras comuns de lixo
-    junk_words = ['reidoebook', 'com', 'net', 'org', 'pdf', 'epub', 'documento', 'texto']
-    if any(junk in text.lower() for junk in junk_words):
+    if _AUTHOR_JUNK_RE.search(lower):
         return False
     
     # Verificar se está na lista de autores conhecidos
-    if any(author.lower() == text.lower() for author in KNOWN_AUTHORS):
+    if lower in _KNOWN_AUTHORS_LC:
         return True
     
+    # Uma passada pelas palavras: capitalização, palavras significativas e stopwords
+    capitalized = True
+    meaningful = 0
+    only_stopwords = True
+    words = text.split()
+    for word in words:
+        if word.isalpha():
+            if not word[0].isupper():
+                capitalized = False
+            if len(word) > 2:
+                meaningful += 1
+        if only_stopwords and word.lower() not in _STOPWORDS:
+            only_stopwords = False
+    
+    # Não pode conter apenas stopwords
+    if only_stopwords:
+        return False
     
+    score = 0
     # 1. Começa com letra maiúscula em cada palavra (apenas palavras alfabéticas)
-    if all(word and word[0].isupper() for word in words if word.isalpha()):
+    if capitalized:
         score += 1
-    
     # 2. Máximo 4 palavras (autores raramente têm mais)
     if len(words) <= 4:
         score += 1
-    
     # 3. Contém sobrenomes comuns
-    common_surnames = ['king', 'brown', 'coelho', 'rowling', 'martin', 'tolkien', 
-                      'riordan', 'crichton', 'assis', 'lispector', 'amado', 'verissimo',
-                      'cury', 'green', 'sparks', 'sheldon', 'follett', 'koontz']
-    if any(surname.lower() in text.lower() for surname in common_surnames):
+    if _COMMON_SURNAMES_RE.search(lower):
         score += 1
-    
-    # 4. Está na lista de autores conhecidos (com peso maior)
-    if any(author.lower() == text.lower() for author in KNOWN_AUTHORS):
-        score += 2  # peso maior para autores exatos
-    
-    # 5. REGRA NOVA: Deve conter pelo menos 2 letras em cada palavra significativa
-    meaningful_words = [word for word in words if len(word) > 2 and word.isalpha()]
-    if len(meaningful_words) >= 2:
+    # 4. Deve conter pelo menos 2 palavras significativas
+    if meaningful >= 2:
         score += 1
     
-    # 6. REGRA NOVA: Não pode conter apenas stopwords
-    stopwords = ['the', 'and', 'or', 'of', 'de', 'da', 'do', 'das', 'dos', 'a', 'o', 'as', 'os']
-    if all(word.lower() in stopwords for word in words):
-        return False
-    
     return score >= 3  # Aumentei o threshold para 3
 
+@functools.lru_cache(maxsize=8192)
 def looks_like_title(text: str) -> bool:
     """Verifica se o texto parece ser um título usando heurística mais flexível"""
-    if not text or len(text) < 3:
+    if not text:
         return False
     
     text = text.strip()
+    n = len(text)
     
-    # Títulos muito longos são suspeitos
-    if len(text) > 150:
+    # Muito curtos ou muito longos (> 150) são suspeitos
+    if n < 3 or n > 150:
         return False
     
     # Títulos não devem ser apenas números
@@ -709,203 +1415,129 @@ def looks_like_title(text: str) -> bool:
         return False
     
     # Títulos não devem ser apenas letras maiúsculas (exceto siglas)
-    if text.isupper() and len(text) > 8:
+    if n > 8 and text.isupper():
         return False
     
-    # Títulos geralmente têm múltiplas palavras ou são significativos
-    words = text.split()
-    
-    # Se tem múltiplas palavras, provavelmente é título
-    if len(words) >= 2:
-        return True
-    
-    # Títulos de uma palavra devem ser significativos
-    if len(words) == 1 and len(text) > 4:
-        return True
-    
-    return False
+    # Múltiplas palavras ou uma única palavra significativa
+    return n > 4 or len(text.split()) >= 2
 
 def extract_year_from_filename(text):
     """Extrai ano de uma string de filename"""
     try:
-        # Padrões de ano: (1999), [1999], 1999, - 1999, etc.
-        patterns = [
-            r'[\(\[](\d{4})[\)\]]',  # (1999) ou [1999]
-            r'\b(\d{4})\b',           # 1999 (standalone)
-            r'[-–—](\d{4})[-–—]',     # -1999-
-            r'\s(\d{4})\s',           # espaço1999espaço
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
+        for rx in _YEAR_RES:
+            match = rx.search(text)
             if match:
                 year = match.group(1)
                 # Validar se é um ano plausível (entre 1000 e ano atual + 1)
-                current_year = datetime.now().year
-                if year.isdigit() and 1000 <= int(year) <= current_year + 1:
+                if year.isdigit() and 1000 <= int(year) <= _CURRENT_YEAR + 1:
                     return year
     except:
         pass
     return None
 
     
+def _nfkc(text):
+    """Forma NFKC do texto (ASCII puro já está normalizado)"""
+    return text if text.isascii() else unicodedata.normalize('NFKC', text)
+
 def clean_search_query_metadados(text):
     """Limpeza para metadados - remove apenas lixo digital"""
     if not text:
         return ""
     
-    # Remover apenas lixo digital óbvio
-    junk_patterns = [
-        r'\(z-library\)', r'\(z-lib\)', r'\(libgen\)', r'\(pdf\)', r'\(epub\)', 
-        r'\bmicrosoft\s+word\b', r'\(pdfcofee\)',  # Remove "Microsoft Word" como frase
-        r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$',
-        r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
-        r'\[1\]', r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b',
-        r'\b\d+p\b', r'\b\d+k\b', r'\[\d+\]',
-        r'reidoebook', r'livrosparatodos', r'z-lib',r'pdf-free',
-        r'\.com', r'\.net', r'\.org'
-        r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
-    ]
+    # Normalizar forma Unicode antes de tudo: os padrões passam a ver
+    # letras de largura total, espaços especiais etc. na forma comum
+    text = _nfkc(text)
     
-    for pattern in junk_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-
-    # Normalizar forma Unicode (ajuda com traços e espaços especiais)
-    text = unicodedata.normalize('NFKC', text)
+    # Remover apenas lixo digital óbvio
+    text = _sub_all(_METADATA_JUNK_RES, text)
     
-    # Substituir espaços "invisíveis" por espaço normal
-    text = re.sub(r'[\u00A0\u2007\u202F]', ' ', text)
+    # Traços unicode -> hífen ASCII
+    text = text.translate(_DASH_TABLE)
 
-    # Unificar traços unicode em hífen ASCII
-    text = re.sub(r'[\u2012\u2013\u2014\u2212\u2043\uFE63\uFF0D]', '-', text)
-
-    # Substituir underlines por espaços, mas manter hífens (podem ser separadores)
-    #text = re.sub(r'_', ' ', text)
-    
     # Substituir underlines e + por espaços
-    text = re.sub(r'[_+]+', ' ', text)
+    text = _UND_PLUS_RUN_RE.sub(' ', text)
     
     # Remover pontos extras que não são abreviações (como "livro.nome.pdf")
     # Mantém pontos se estiverem entre letras maiúsculas (abreviações: "J. K. Rowling")
-    text = re.sub(r'(?<!\b[A-Z])\.(?![A-Z]\b)', ' ', text)
+    text = _LOOSE_DOT_RE.sub(' ', text)
     
     # Remover extensões de arquivo
-    text = re.sub(r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$', '', text, flags=re.IGNORECASE)
+    text = _EXT_RE.sub('', text)
 
     # Substituir traços grudados em palavras por espaço (mas manter os que têm espaço dos dois lados)
-    text = re.sub(r'(?<=\w)-(?=\w)', ' ', text)
-    # Remover traços no início ou no fim do nome (isolados ou múltiplos)
-    #text = re.sub(r'^-+\s*', '', text)  # Remove traços no início
-    #text = re.sub(r'\s*-+$', '', text)  # Remove traços no final
+    text = _INNER_DASH_RE.sub(' ', text)
     # Remover traços no início ou no fim, tolerando espaços e qualquer quantidade deles
     # (agora pega " - Título", "- Título", "Título -", "Título -   ")
-    text = re.sub(r'^\s*-+\s*', '', text)   # início
-    text = re.sub(r'\s*-+\s*$', '', text)   # fim
+    text = _LEAD_DASH_RE.sub('', text)   # início
+    text = _TRAIL_DASH_RE.sub('', text)  # fim
 
     # Remover prefixos irrelevantes no início do nome
-    irrelevant_prefixes = [
-        'pdfcoffee', 'livrosparatodos', 'reidoebook', 'docero', 'zlibrary', 'libgen',
-        'ebooksgratis', 'baixarlivros', 'downloadlivros', 'freebook', 'biblioteca'
-        ]
-    for prefix in irrelevant_prefixes:
-        text = re.sub(rf'^{prefix}\s+', '', text, flags=re.IGNORECASE)
-        
+    for rx in _IRRELEVANT_PREFIX_RES:
+        text = rx.sub('', text)
         
     # Manter a estrutura original do texto
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     
     return text
 
+@functools.lru_cache(maxsize=8192)
 def clean_search_query_nome_arquivo(text):
     """Limpeza para nome do arquivo - remove lixo mas mantém informações importantes"""
     if not text:
         return ""
+    original = text
+    
+    # Normalizar forma Unicode antes de tudo: os padrões passam a ver
+    # letras de largura total, espaços especiais etc. na forma comum
+    text = _nfkc(text)
     
     # Remover números entre colchetes [1], [2], etc.
-    text = re.sub(r'\[\d+\]', '', text)
+    text = _BRACKET_NUM_RE.sub('', text)
     
     # Remover padrões específicos de lixo
-    junk_patterns = [
-        r'\(z-library\)', r'\(z-lib\)', r'\(libgen\)', r'\(pdf\)', r'\(epub\)', 
-        r'\bmicrosoft\s+word\b', r'\(pdfcofee\), r'r'\blivro\s+de\b',  # Remove "Microsoft Word" como frase
-        r'\[.*?\]', r'\(.*?\)', r'\d+p', r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$',
-        r'www\.\w+\.com', r'\.com', r'\.org', r'\.net', r'http[s]?://',
-        r'\[1\]', r'\.\.\.', r'\b\w*libgen\w*\b', r'\b\w*zlib\w*\b',
-        r'\b\d+p\b', r'\b\d+k\b', r'\[\d+\]',
-        r'reidoebook', r'livrosparatodos', r'z-lib',r'pdf-free',
-        r'\.com', r'\.net', r'\.org'
-        r'\b\w*download\w*\b', r'\b\w*free\w*\b', r'\b\w*ebook\w*\b'
-    ]
-    
-    for pattern in junk_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-    
-    # Normalizar forma Unicode (ajuda com traços e espaços especiais)
-    text = unicodedata.normalize('NFKC', text)
-    
-    # Substituir espaços "invisíveis" por espaço normal
-    text = re.sub(r'[\u00A0\u2007\u202F]', ' ', text)
+    text = _sub_all(_FILENAME_JUNK_RES, text)
     
-    # Unificar traços unicode em hífen ASCII
-    text = re.sub(r'[\u2012\u2013\u2014\u2212\u2043\uFE63\uFF0D]', '-', text)
+    # Traços unicode -> hífen ASCII
+    text = text.translate(_DASH_TABLE)
     
-    # Remover sequências de caracteres especiais
-    text = re.sub(r'[+_]{2,}', ' ', text)  # ++, +_+, etc.
-    text = re.sub(r'\.{2,}', ' ', text)    # .., ..., etc.
-    
-    # Substituir underlines por espaços, mas manter hífens (podem ser separadores)
-    #text = re.sub(r'_', ' ', text)
-    
-    # Substituir underlines e + por espaços
-    text = re.sub(r'[+_]', ' ', text)
+    # Sequências de underlines e + (uma ou mais, "++", "+_+") viram um espaço
+    text = _UND_PLUS_RUN_RE.sub(' ', text)
+    text = _DOT_MULTI_RE.sub(' ', text)       # .., ..., etc.
     
     # Remover pontos extras que não são abreviações (como "livro.nome.pdf")
     # Mantém pontos se estiverem entre letras maiúsculas (abreviações: "J. K. Rowling")
-    text = re.sub(r'(?<!\b[A-Z])\.(?![A-Z]\b)', ' ', text)
+    text = _LOOSE_DOT_RE.sub(' ', text)
     
     # Substituir traços grudados em palavras por espaço (mas manter os que têm espaço dos dois lados)
-    text = re.sub(r'(?<=\w)-(?=\w)', ' ', text)
-    # Remover traços no início ou no fim do nome (isolados ou múltiplos)
-    #text = re.sub(r'^-+\s*', '', text)  # Remove traços no início
-    #text = re.sub(r'\s*-+$', '', text)  # Remove traços no final
+    text = _INNER_DASH_RE.sub(' ', text)
     # Remover traços no início ou no fim, tolerando espaços e qualquer quantidade deles
     # (agora pega " - Título", "- Título", "Título -", "Título -   ")
-    text = re.sub(r'^\s*-+\s*', '', text)   # início
-    text = re.sub(r'\s*-+\s*$', '', text)   # fim
+    text = _LEAD_DASH_RE.sub('', text)   # início
+    text = _TRAIL_DASH_RE.sub('', text)  # fim
     
     # Remover extensões de arquivo
-    text = re.sub(r'\.(pdf|epub|mobi|azw3|docx?|txt|zip|rar)$', '', text, flags=re.IGNORECASE)
+    text = _EXT_RE.sub('', text)
     
     # Remover números isolados entre espaços (mas manter números que fazem parte do texto)
-    text = re.sub(r'\s\d+\s', ' ', text)   # espaços + números + espaços
-    text = re.sub(r'^\d+\s', '', text)     # números no início
-    text = re.sub(r'\s\d+$', '', text)     # números no final
+    text = _NUM_MID_RE.sub(' ', text)   # espaços + números + espaços
+    text = _NUM_LEAD_RE.sub('', text)   # números no início
+    text = _NUM_TAIL_RE.sub('', text)   # números no final
     
     # Remover "documento de texto" e variações
-    doc_patterns = [
-        r'novo\s*(?:documento|arquivo|file)',
-        r'novo\s*(?:doc|txt|texto)',
-        r'documento\s*(?:de\s*texto|sem\s*título)',
-        r'untitled', r'sem título'
-    ]
-    
-    for pattern in doc_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _sub_all(_DOC_RES, text)
     
     # Normalizar espaços
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WS_RE.sub(' ', text).strip()
     
     # Se ficou muito curto após limpeza, usar o original
     if len(text) < 3:
-        # Fallback: limpeza mínima
-        original_text = re.sub(r'\[\d+\]', '', text)
-        original_text = re.sub(r'[+_]{2,}', ' ', original_text)
-        original_text = re.sub(r'[+_]', ' ', original_text)
-        original_text = re.sub(r'\s+', ' ', original_text).strip()
-        return original_text
+        # Fallback: limpeza mínima do texto recebido (sem extensão)
+        original = _BRACKET_NUM_RE.sub('', _EXT_RE.sub('', original)).translate(_UND_PLUS_TABLE)
+        return _WS_RE.sub(' ', original).strip()
     
     return text
-    
+
 def extract_isbn(filepath):
     """Tenta extrair ISBN de arquivos com tratamento de erro robusto"""
     try:
@@ -933,78 +1565,194 @@ def extract_isbn_rigorous(filepath):
         print(f"Erro ao extrair ISBN de {filepath}: {e}")
         return None
 
+def _pdf_page_indices(n):
+    """Índices das primeiras e últimas páginas lidas na busca de ISBN"""
+    head = range(min(n, PDF_ISBN_FIRST_PAGES))
+    tail = range(max(PDF_ISBN_FIRST_PAGES, n - PDF_ISBN_LAST_PAGES), n)
+    return list(head) + list(tail)
+
+def iter_pdf_pages_text(filepath):
+    """Texto das primeiras e últimas páginas do PDF, página a página (PDFium quando disponível).
+
+    Gerador: páginas só são extraídas quando consumidas, então quem para no
+    primeiro resultado não paga pelas páginas seguintes.
+    """
+    pdf = None
+    if HAS_PDFIUM:
+        try:
+            with _PDFIUM_LOCK:
+                pdf = pdfium.PdfDocument(filepath)
+                n_pages = len(pdf)
+        except Exception:
+            pdf = None  # PDF que o PDFium não abre: tentar com PyPDF2
+    if pdf is not None:
+        try:
+            for i in _pdf_page_indices(n_pages):
+                # Lock por página, e não pelo gerador todo: quem consome as
+                # páginas pode demorar entre uma e outra
+                try:
+                    with _PDFIUM_LOCK:
+                        page = pdf[i]
+                        textpage = page.get_textpage()
+                        try:
+                            page_text = textpage.get_text_range()
+                        finally:
+                            textpage.close()
+                            page.close()
+                except Exception:
+                    continue
+                if page_text:
+                    yield page_text
+        finally:
+            with _PDFIUM_LOCK:
+                pdf.close()
+        return
+    
+    with open(filepath, 'rb') as f:
+        reader = PdfReader(f)
+        for i in _pdf_page_indices(len(reader.pages)):
+            try:
+                page_text = reader.pages[i].extract_text()
+            except:
+                continue
+            if page_text:
+                yield page_text
+
+def _isbn_from_page_text(text):
+    """Primeiro ISBN plausível de uma página, na ordem de prioridade dos padrões"""
+    for rx in _ISBN_SMART_RES:
+        for match in rx.finditer(text):
+            isbn_candidate = _ISBN_STRIP_RE.sub('', match.group().upper())
+            
+            # Validação rigorosa mas realista
+            if (len(isbn_candidate) in [10, 13] and 
+                is_valid_isbn(isbn_candidate) and
+                not isbn_candidate.startswith(('0000', '1111', '1234', '9999')) and
+                len(set(isbn_candidate)) > 4):  # Não pode ter muitos dígitos repetidos
+                
+                # Verificar contexto - ISBN deve estar perto de palavras relevantes
+                context = text[max(0, match.start()-50):match.end()+50].lower()
+                if any(keyword in context for keyword in ['isbn', 'book', 'edition', 'publish']):
+                    return isbn_candidate
+    return None
+
+def pdf_may_have_text(filepath):
+    """Falso só quando o PDF comprovadamente não tem texto extraível.
+
+    Sem nenhuma fonte (/Font) não há texto, e sem object streams (/ObjStm)
+    todos os dicionários estão descomprimidos no arquivo, então a ausência do
+    nome é conclusiva. É o caso de digitalizações e quadrinhos. Procurar o
+    próprio "ISBN" nos bytes brutos não serviria: o conteúdo das páginas
+    costuma estar comprimido.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if not size or size > PDF_PRESCREEN_MAX_SIZE:
+                return True  # vazio (mmap falharia) ou grande demais para varrer inteiro
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(b'/Font') >= 0 or mm.find(b'/ObjStm') >= 0
+    except (OSError, ValueError):
+        return True
+
 def extract_isbn_from_pdf_smart(filepath):
     """Extrai ISBN de PDFs de forma inteligente, focando em áreas relevantes"""
     try:
-        with open(filepath, 'rb') as f:
-            # Ler apenas as primeiras páginas onde ISBNs geralmente aparecem
-            reader = PdfReader(f)
-            text_chunks = []
-            
-            # Coletar texto das primeiras 5 páginas e últimas 2 páginas
-            for i, page in enumerate(reader.pages):
-                if i < 5 or i > len(reader.pages) - 3:  # Primeiras 5 e últimas 2
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text_chunks.append(page_text)
-                    except:
-                        continue
-            
-            text = " ".join(text_chunks)
-            
-            # Procurar ISBNs em contextos específicos
-            isbn_patterns = [
-                r'ISBN[-]*(1[03])?[:]?[\s]*([0-9X\-]{10,17})',
-                r'ISBN[\s]*([0-9X\-]{10,17})',
-                r'(97[89][\-]?[0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])',
-            ]
-            
-            found_isbns = []
-            
-            for pattern in isbn_patterns:
-                matches = re.finditer(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    isbn_candidate = re.sub(r'[^\dX]', '', match.group().upper())
-                    
-                    # Validação rigorosa mas realista
-                    if (len(isbn_candidate) in [10, 13] and 
-                        is_valid_isbn(isbn_candidate) and
-                        not isbn_candidate.startswith(('0000', '1111', '1234', '9999')) and
-                        len(set(isbn_candidate)) > 4):  # Não pode ter muitos dígitos repetidos
-                        
-                        # Verificar contexto - ISBN deve estar perto de palavras relevantes
-                        context = text[max(0, match.start()-50):match.end()+50].lower()
-                        if any(keyword in context for keyword in ['isbn', 'book', 'edition', 'publish']):
-                            found_isbns.append(isbn_candidate)
+        # PDF só de imagens: nem abrir o parser
+        if not pdf_may_have_text(filepath):
+            return None
+        
+        # Ler apenas as primeiras e últimas páginas, onde ISBNs geralmente aparecem,
+        # parando na primeira página que já traz um ISBN válido
+        for page_text in iter_pdf_pages_text(filepath):
+            isbn = _isbn_from_page_text(page_text)
+            if isbn:
+                return isbn
             
-            if found_isbns:
-                return found_isbns[0]  # Retornar o primeiro ISBN válido
-                
     except Exception as e:
         print(f"Erro ao extrair ISBN de PDF {filepath}: {e}")
     
     return None
 
+# Padrões de ISBN por literal inicial: cada casamento começa numa ocorrência
+# de "ISBN" (sem diferenciar maiúsculas) ou de "978"/"979"
+_ISBN_LABEL_RES = (
+    re.compile(r'ISBN[-]*(1[03])?[:]?[\s]*([0-9X\-]{10,17})', re.IGNORECASE),
+    re.compile(r'ISBN[\s]*([0-9X\-]{10,17})', re.IGNORECASE),
+)
+# Padrões do extrator "inteligente" de PDF, em ordem de prioridade
+_ISBN_SMART_RES = _ISBN_LABEL_RES + (
+    re.compile(r'(97[89][\-]?[0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])', re.IGNORECASE),
+)
+# Mesmos padrões em bytes, para varrer o conteúdo bruto do PDF sem decodificar
+_ISBN_PDF_BYTES_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    rb'ISBN[-]*(1[03])?[:]?[\s]*([0-9X\-]{10,17})',
+    rb'ISBN[\s]*([0-9X\-]{10,17})',
+    rb'(97[89][\-]?[0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])',
+    rb'([0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])',
+))
+_ISBN_STRIP_BYTES_RE = re.compile(rb'[^\dX]')
+# Bytes decodificados a partir de cada ocorrência literal
+ISBN_SCAN_WINDOW = 256
+# Resto de janela que um padrão de ISBN ainda poderia estar consumindo
+_ISBN_OPEN_TAIL_RE = re.compile(r'[\s0-9X:\-]*', re.IGNORECASE)
+
+# Literal "ISBN" (sem diferenciar maiúsculas) procurado direto nos bytes
+_ISBN_LITERAL_BYTES_RE = re.compile(rb'isbn', re.IGNORECASE)
+
+@contextlib.contextmanager
+def _mapped_file(f, size):
+    """mmap só leitura do arquivo aberto (sem copiar para um bytes); quando o
+    arquivo não pode ser mapeado (vazio, por exemplo) cai para f.read(size)"""
+    try:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+        mm = None
+    if mm is None:
+        yield f.read(size)
+        return
+    with mm:
+        yield mm
+
+def _iter_isbn_literal_matches(content, limit, rx, hits):
+    """Casamentos de `rx` em ordem, tentados só nas posições `hits` do literal.
+
+    Equivale ao findall sobre content[:limit] decodificado (o padrão começa
+    pelo literal), mas decodifica e varre apenas janelas pequenas.
+    """
+    end = 0
+    for pos, size in hits:
+        if pos < end:
+            continue  # dentro de um casamento anterior (findall não sobrepõe)
+        text = content[pos:min(pos + ISBN_SCAN_WINDOW, limit)].decode('utf-8', errors='ignore')
+        m = rx.match(text)
+        if (pos + ISBN_SCAN_WINDOW < limit and
+                _ISBN_OPEN_TAIL_RE.fullmatch(text, size)):
+            # Janela cortada no meio de um possível casamento: usar o resto do bloco
+            text = content[pos:limit].decode('utf-8', errors='ignore')
+            m = rx.match(text)
+        if m:
+            end = pos + m.end()
+            yield m
+
+def _isbn_match_text(m):
+    """Grupo com o número (o 2º quando o padrão também captura '10'/'13')"""
+    return m.group(2) if m.re.groups > 1 else m.group(1)
+
 def extract_isbn_generic(filepath):
     """Extração genérica de ISBN para outros formatos"""
     try:
-        with open(filepath, 'rb') as f:
-            content = f.read(50000)  # 50KB
-            text = content.decode('utf-8', errors='ignore')
+        with open(filepath, 'rb') as f, _mapped_file(f, 50000) as content:
+            limit = min(len(content), 50000)  # 50KB
             
-            isbn_patterns = [
-                r'ISBN[-]*(1[03])?[:]?[\s]*([0-9X\-]{10,17})',
-                r'ISBN[\s]*([0-9X\-]{10,17})',
-            ]
+            # Os dois padrões exigem o literal "ISBN": sem ele não há o que procurar
+            hits = [(m.start(), 4) for m in _ISBN_LITERAL_BYTES_RE.finditer(content, 0, limit)]
+            if not hits:
+                return None
             
-            for pattern in isbn_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        match = match[1] if len(match) > 1 else match[0]
-                    
-                    isbn_candidate = re.sub(r'[^\dX]', '', match.upper())
+            for rx in _ISBN_LABEL_RES:
+                for m in _iter_isbn_literal_matches(content, limit, rx, hits):
+                    isbn_candidate = _ISBN_STRIP_RE.sub('', _isbn_match_text(m).upper())
                     
                     if (len(isbn_candidate) in [10, 13] and 
                         is_valid_isbn(isbn_candidate) and
@@ -1019,27 +1767,15 @@ def extract_isbn_generic(filepath):
 def extract_isbn_from_pdf(filepath):
     """Extrai ISBN de PDFs com validação rigorosa"""
     try:
-        with open(filepath, 'rb') as f:
-            # Ler apenas parte inicial do arquivo
-            content = f.read(100000)  # 100KB
-            text = content.decode('utf-8', errors='ignore')
+        with open(filepath, 'rb') as f, _mapped_file(f, 100000) as content:
+            # Apenas a parte inicial do arquivo
+            limit = min(len(content), 100000)  # 100KB
             
-            # Padrões de ISBN mais específicos
-            isbn_patterns = [
-                r'ISBN[-]*(1[03])?[:]?[\s]*([0-9X\-]{10,17})',
-                r'ISBN[\s]*([0-9X\-]{10,17})',
-                r'(97[89][\-]?[0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])',
-                r'([0-9]{1,5}[\-]?[0-9]{1,7}[\-]?[0-9]{1,6}[\-]?[0-9X])'
-            ]
-            
-            for pattern in isbn_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        match = match[1] if len(match) > 1 else match[0]
-                    
+            # Varre os bytes direto: o ISBN é ASCII, só o grupo casado é decodificado
+            for rx in _ISBN_PDF_BYTES_RES:
+                for m in rx.finditer(content, 0, limit):
                     # Limpar e validar ISBN
-                    isbn_candidate = re.sub(r'[^\dX]', '', match)
+                    isbn_candidate = _ISBN_STRIP_BYTES_RE.sub(b'', _isbn_match_text(m)).decode('ascii')
                     
                     # Validar comprimento e checksum
                     if len(isbn_candidate) in [10, 13] and is_valid_isbn(isbn_candidate):
@@ -1050,50 +1786,56 @@ def extract_isbn_from_pdf(filepath):
     
     return None
 
+_ISBN_STRIP_RE = re.compile(r'[^\dX]')
+_ISBN10_WEIGHTS = (10, 9, 8, 7, 6, 5, 4, 3, 2)
+_ISBN13_WEIGHTS = (1, 3) * 6
+# Σ(ord(c) - 48)·w = Σ ord(c)·w - 48·Σw: a correção é constante por tamanho
+_ISBN10_OFFSET = 48 * sum(_ISBN10_WEIGHTS)
+_ISBN13_OFFSET = 48 * sum(_ISBN13_WEIGHTS)
+
+def _isbn_weighted_sum(body, weights, offset):
+    """Soma ponderada dos dígitos direto dos bytes ASCII (sem int() por caractere)"""
+    if body.isascii():
+        return sum(map(operator.mul, body.encode('ascii'), weights)) - offset
+    # Dígitos não ASCII (aceitos por \d) continuam passando por int()
+    return sum(map(operator.mul, map(int, body), weights))
+
+# Memoizado: o mesmo candidato aparece várias vezes no texto de um PDF
+@functools.lru_cache(maxsize=8192)
 def is_valid_isbn(isbn):
     """Validação RIGOROSA de ISBN"""
-    isbn = re.sub(r'[^\dX]', '', str(isbn)).upper()
+    isbn = str(isbn)
+    # Candidatos já limpos (dígitos ASCII, com X final opcional) dispensam o re.sub
+    if not (isbn.isascii() and (isbn.isdigit() or (isbn[:-1].isdigit() and isbn[-1:] == 'X'))):
+        isbn = _ISBN_STRIP_RE.sub('', isbn).upper()
     
-    # Rejeitar ISBNs falsos óbvios
-    if (isbn.startswith('0000000') or 
-        isbn == '0000000000' or 
-        isbn == '0000000000000' or
-        len(set(isbn)) == 1):  # Todos dígitos iguais
+    # Rejeitar ISBNs falsos óbvios (zeros ou todos dígitos iguais)
+    if isbn.startswith('0000000') or len(set(isbn)) == 1:
         return False
     
     if len(isbn) == 10:
         # Validar ISBN-10
-        total = 0
-        for i in range(9):
-            if not isbn[i].isdigit():
-                return False
-            total += int(isbn[i]) * (10 - i)
-        
-        if isbn[9] == 'X':
+        body, last = isbn[:9], isbn[9]
+        if not body.isdigit():
+            return False
+        if last == 'X':
             check = 10
-        elif isbn[9].isdigit():
-            check = int(isbn[9])
+        elif last.isdigit():
+            check = int(last)
         else:
             return False
-            
+        total = _isbn_weighted_sum(body, _ISBN10_WEIGHTS, _ISBN10_OFFSET)
         return (total + check) % 11 == 0
         
     elif len(isbn) == 13:
         # Validar ISBN-13
-        if not isbn.startswith('978') and not isbn.startswith('979'):
+        if not isbn.startswith(('978', '979')):
             return False
-            
-        total = 0
-        for i in range(12):
-            if not isbn[i].isdigit():
-                return False
-            total += int(isbn[i]) * (1 if i % 2 == 0 else 3)
-            
-        check = 10 - (total % 10)
-        if check == 10:
-            check = 0
-            
-        return isbn[12] == str(check)
+        body = isbn[:12]
+        if not body.isdigit():
+            return False
+        total = _isbn_weighted_sum(body, _ISBN13_WEIGHTS, _ISBN13_OFFSET)
+        return isbn[12] == str(-total % 10)
         
     return False
 
@@ -1125,7 +1867,7 @@ def is_high_quality_local_metadata(meta):
     if (not title or 
         len(title) < 3 or 
         title.isdigit() or
-        any(junk in title.lower() for junk in ['unknown', 'untitled', 'document'])):
+        _LOCAL_JUNK_TITLE_RE.search(title.lower())):
         return False
     
     # Validar autores
@@ -1134,7 +1876,7 @@ def is_high_quality_local_metadata(meta):
     
     # Validar que não é lixo comum
     author_str = ' '.join(authors).lower()
-    if any(junk in author_str for junk in ['unknown', 'anonymous', 'user', 'admin']):
+    if _LOCAL_JUNK_AUTHOR_RE.search(author_str):
         return False
     
     return True
@@ -1168,153 +1910,189 @@ def is_high_quality_filename_metadata(meta, filename):
     
     return True
 
+def _isbn_from_identifiers(identifiers, validate=False):
+    """Primeiro dc:identifier que, sem separadores, tenha 10 ou 13 dígitos"""
+    for id_str in identifiers:
+        candidate = _ISBN_STRIP_RE.sub('', str(id_str))
+        if len(candidate) in (10, 13) and (not validate or is_valid_isbn(candidate)):
+            return candidate
+    return None
+
 def extract_isbn_from_epub(filepath):
     """Extrai ISBN de EPUBs"""
     try:
-        book = epub.read_epub(filepath)
-        identifiers = book.get_metadata('DC', 'identifier')
-        if identifiers:
-            for identifier in identifiers:
-                if identifier[0]:
-                    id_str = str(identifier[0])
-                    if 'isbn' in id_str.lower():
-                        isbn = re.sub(r'[^\dX]', '', id_str)
-                        if len(isbn) in [10, 13]:
-                            return isbn
-                    # Verificar se é um ISBN válido
-                    isbn_candidate = re.sub(r'[^\dX]', '', id_str)
-                    if len(isbn_candidate) in [10, 13]:
-                        return isbn_candidate
+        return _isbn_from_identifiers(read_epub_dc_fields(filepath)['identifier'])
     except:
         pass
     
     return None
 
+def extract_isbn_from_epub_smart(filepath):
+    """Extrai ISBN de EPUBs aceitando só identificadores com dígito verificador válido"""
+    try:
+        return _isbn_from_identifiers(read_epub_dc_fields(filepath)['identifier'], validate=True)
+    except Exception as e:
+        print(f"Erro ao extrair ISBN de EPUB {filepath}: {e}")
+    
+    return None
+
+def _google_isbn_result(items, isbn):
+    """Primeiro volume do Google Books com o ISBN exato e título/autor válidos"""
+    current_isbn = isbn.replace("-", "")
+    for item in items:
+        volume_info = item.get("volumeInfo", {})
+        industry_ids = volume_info.get("industryIdentifiers", [])
+        
+        # VERIFICAÇÃO RIGOROSA: deve ter correspondência exata de ISBN
+        exact_match = False
+        for id_obj in industry_ids:
+            id_type = id_obj.get("type", "").upper()
+            id_value = id_obj.get("identifier", "").replace("-", "")
+            
+            if (id_value == current_isbn and 
+                id_type in ["ISBN_10", "ISBN_13"]):
+                exact_match = True
+                break
+        
+        if exact_match:
+            # VALIDAÇÃO ADICIONAL: deve ter título e autor válidos
+            title = volume_info.get("title", "")
+            authors = volume_info.get("authors", [])
+            
+            if (title and len(title) > 2 and 
+                authors and len(authors) > 0 and 
+                len(authors[0]) > 2):
+                
+                # Extrair ano corretamente
+                published_date = volume_info.get("publishedDate", "")
+                year = None
+                if published_date:
+                    year_match = _YEAR4_PREFIX_RE.search(published_date)
+                    if year_match:
+                        year = year_match.group(1)
+                
+                return {
+                    "title": title,
+                    "authors": authors,
+                    "publishedDate": year,
+                    "categories": volume_info.get("categories", []),
+                    "imageLinks": volume_info.get("imageLinks", {}),
+                    "fonte": "Google Books (ISBN)",
+                    "score": 1.0
+                }
+    return None
+
+# Consultas simultâneas aos autores de um mesmo livro na Open Library
+OL_AUTHOR_WORKERS = 4
+
+def _open_library_author_name(key):
+    """Nome do autor da Open Library pela chave ("/authors/..."); None se falhar"""
+    try:
+        auth_data = http_get_json_cached(f"https://openlibrary.org{key}.json", timeout=10)
+        if auth_data is not None:
+            return auth_data.get("name", "")
+    except:
+        pass
+    return None
+
+def _open_library_isbn_result(isbn):
+    """Busca o ISBN na Open Library (correspondência exata e título/autor válidos)"""
+    url = f"https://openlibrary.org/isbn/{isbn}.json"
+    data = http_get_json_cached(url, timeout=15)
+    if data is not None:
+        
+        # Verificar correspondência exata
+        isbn_10 = data.get("isbn_10", [])
+        isbn_13 = data.get("isbn_13", [])
+        
+        if isbn in isbn_10 or isbn in isbn_13:
+            # Buscar detalhes dos autores (em paralelo quando há mais de um)
+            keys = [auth['key'] for auth in data.get("authors", [])
+                    if isinstance(auth, dict) and auth.get("key")]
+            if len(keys) > 1:
+                with ThreadPoolExecutor(max_workers=min(len(keys), OL_AUTHOR_WORKERS)) as pool:
+                    names = list(pool.map(_open_library_author_name, keys))
+            else:
+                names = [_open_library_author_name(key) for key in keys]
+            authors = [name for name in names if name is not None]
+            
+            if not authors:
+                authors = [auth.get("name", "") for auth in data.get("authors", []) if auth.get("name")]
+            
+            # Validar qualidade
+            if (data.get("title") and authors and 
+                len(data["title"]) > 2 and len(authors[0]) > 2):
+                
+                return {
+                    "title": data.get("title"),
+                    "authors": authors,
+                    "publishedDate": str(data.get("publish_date")) if data.get("publish_date") else None,
+                    "categories": data.get("subjects", [])[:3],
+                    "fonte": "Open Library (ISBN)",
+                    "score": 1.0
+                }
+    return None
+
+def _isbn_cache_key(isbn):
+    """Chave do cache persistente para consultas por ISBN"""
+    return f"isbn:{isbn.replace('-', '')}"
+
 def search_by_isbn(isbn, api_key=None):
     """Busca livro por ISBN com validação EXTREMAMENTE rigorosa"""
+    # Resultados por ISBN não mudam: reaproveitar o cache entre execuções
+    cache_key = _isbn_cache_key(isbn)
+    cached = get_cached_data(cache_key)
+    if cached:
+        return cached
+    
     try:
         # Primeiro tenta Google Books
         url = f"https://www.googleapis.com/books/v1/volumes?q=isbn:{isbn}"
         if api_key:
             url += f"&key={api_key}"
         
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            if "items" in data and len(data["items"]) > 0:
-                for item in data["items"]:
-                    volume_info = item.get("volumeInfo", {})
-                    industry_ids = volume_info.get("industryIdentifiers", [])
-                    
-                    # VERIFICAÇÃO RIGOROSA: deve ter correspondência exata de ISBN
-                    exact_match = False
-                    for id_obj in industry_ids:
-                        id_type = id_obj.get("type", "").upper()
-                        id_value = id_obj.get("identifier", "").replace("-", "")
-                        current_isbn = isbn.replace("-", "")
-                        
-                        if (id_value == current_isbn and 
-                            id_type in ["ISBN_10", "ISBN_13"]):
-                            exact_match = True
-                            break
-                    
-                    if exact_match:
-                        # VALIDAÇÃO ADICIONAL: deve ter título e autor válidos
-                        title = volume_info.get("title", "")
-                        authors = volume_info.get("authors", [])
-                        
-                        if (title and len(title) > 2 and 
-                            authors and len(authors) > 0 and 
-                            len(authors[0]) > 2):
-                            
-                            # Extrair ano corretamente
-                            published_date = volume_info.get("publishedDate", "")
-                            year = None
-                            if published_date:
-                                year_match = re.search(r'(\d{4})', published_date)
-                                if year_match:
-                                    year = year_match.group(1)
-                            
-                            return {
-                                "title": title,
-                                "authors": authors,
-                                "publishedDate": year,
-                                "categories": volume_info.get("categories", []),
-                                "imageLinks": volume_info.get("imageLinks", {}),
-                                "fonte": "Google Books (ISBN)",
-                                "score": 1.0
-                            }
+        data = http_get_json_cached(url, is_empty=_no_items, timeout=15)
+        if data is not None:
+            resultado = _google_isbn_result(data.get("items") or [], isbn)
+            if resultado:
+                set_cached_data(cache_key, resultado, CACHE_ISBN_TTL_SECONDS)
+                return resultado
         
         # Open Library apenas se não encontrou no Google Books
-        url = f"https://openlibrary.org/isbn/{isbn}.json"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
-            
-            # Verificar correspondência exata
-            isbn_10 = data.get("isbn_10", [])
-            isbn_13 = data.get("isbn_13", [])
-            
-            if isbn in isbn_10 or isbn in isbn_13:
-                authors = []
-                for auth in data.get("authors", []):
-                    if isinstance(auth, dict) and auth.get("key"):
-                        # Buscar detalhes do autor
-                        try:
-                            auth_url = f"https://openlibrary.org{auth['key']}.json"
-                            auth_response = requests.get(auth_url, timeout=10)
-                            if auth_response.status_code == 200:
-                                auth_data = auth_response.json()
-                                authors.append(auth_data.get("name", ""))
-                        except:
-                            continue
-                
-                if not authors:
-                    authors = [auth.get("name", "") for auth in data.get("authors", []) if auth.get("name")]
-                
-                # Validar qualidade
-                if (data.get("title") and authors and 
-                    len(data["title"]) > 2 and len(authors[0]) > 2):
-                    
-                    return {
-                        "title": data.get("title"),
-                        "authors": authors,
-                        "publishedDate": str(data.get("publish_date")) if data.get("publish_date") else None,
-                        "categories": data.get("subjects", [])[:3],
-                        "fonte": "Open Library (ISBN)",
-                        "score": 1.0
-                    }
+        resultado = _open_library_isbn_result(isbn)
+        if resultado:
+            set_cached_data(cache_key, resultado, CACHE_ISBN_TTL_SECONDS)
+        return resultado
                     
     except Exception as e:
         print(f"Erro na busca por ISBN {isbn}: {e}")
     
     return None
 
-
 def extract_year_from_date(date_str):
     """Extrai ano de forma robusta de strings de data"""
     if not date_str:
         return None
     
-    # Padrões comuns de data
-    patterns = [
-        r'(\d{4})',  # Apenas ano (1999)
-        r'(\d{4})-\d{2}-\d{2}',  # ISO (1999-12-31)
-        r'\d{2}/(\d{4})',  # MM/YYYY
-        r'\d{2}-\d{2}-(\d{4})',  # DD-MM-YYYY
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, str(date_str))
+    date_str = str(date_str)
+    for rx in _DATE_YEAR_RES:
+        match = rx.search(date_str)
         if match:
             year = match.group(1)
             # Validar se é um ano plausível (entre 1000 e ano atual + 1)
-            current_year = datetime.now().year
-            if 1000 <= int(year) <= current_year + 1:
+            if 1000 <= int(year) <= _CURRENT_YEAR + 1:
                 return year
     
     return None
     
+# Padrões comuns em arquivos Office: (campo, regex)
+_OFFICE_META_RES = tuple((key, re.compile(p, re.IGNORECASE)) for key, p in (
+    ('title', r'Title:\s*(.*?)\n'),
+    ('author', r'Author:\s*(.*?)\n'),
+    ('title', r'<title>(.*?)</title>'),
+    ('author', r'<author>(.*?)</author>'),
+))
+
 def extract_office_metadata(filepath):
     """Tenta extrair metadados de arquivos Office de forma segura"""
     try:
@@ -1325,22 +2103,11 @@ def extract_office_metadata(filepath):
                 content = f.read(5000)
                 text = content.decode('utf-8', errors='ignore')
                 
-                # Padrões comuns em arquivos Office
-                patterns = [
-                    r'Title:\s*(.*?)\n',
-                    r'Author:\s*(.*?)\n',
-                    r'<title>(.*?)</title>',
-                    r'<author>(.*?)</author>',
-                ]
-                
                 metadata = {}
-                for pattern in patterns:
-                    match = re.search(pattern, text, re.IGNORECASE)
-                    if match:
-                        if 'title' in pattern.lower() and not metadata.get('title'):
-                            metadata['title'] = match.group(1).strip()
-                        elif 'author' in pattern.lower() and not metadata.get('author'):
-                            metadata['author'] = match.group(1).strip()
+                for key, rx in _OFFICE_META_RES:
+                    match = rx.search(text)
+                    if match and not metadata.get(key):
+                        metadata[key] = match.group(1).strip()
                 
                 return metadata
     except:
@@ -1349,36 +2116,26 @@ def extract_office_metadata(filepath):
 
 def normalize_unknown_filename(filename):
     """Normaliza nome de arquivo para arquivos não identificados - SEM padrão de nome"""
-    name, ext = os.path.splitext(filename)
+    base, ext = os.path.splitext(filename)
+    name = base
     
     # Remover padrões comuns de lixo mas manter informações úteis
-    patterns_to_remove = [
-        r'reidoebook\[?\d*\]?\.com[+-]*',
-        r'www\.\w+\.com',
-        r'z-library',
-        r'\(z-library\)',
-        r'pdfcoffee\.com',
-        r'\(.*?\)',
-        r'\[.*?\]',
-        r'\d{4}',
-    ]
-    
-    for pattern in patterns_to_remove:
-        name = re.sub(pattern, ' ', name, flags=re.IGNORECASE)
+    for rx in _UNKNOWN_JUNK_RES:
+        name = rx.sub(' ', name)
     
     # Substituir caracteres especiais por espaços
-    name = re.sub(r'[+_]', ' ', name)
+    name = _PLUS_UND_RE.sub(' ', name)
     
     # Remover múltiplos espaços e caracteres especiais problemáticos
-    name = re.sub(r'\s+', ' ', name)
-    name = re.sub(r'[^\w\s\-\.]', '', name)
+    name = _WS_RE.sub(' ', name)
+    name = _UNKNOWN_NAME_CHARS_RE.sub('', name)
     name = name.strip()
     
     # Se ficou muito curto, usar nome original (mais limpo)
     if len(name) < 3:
-        name = re.sub(r'[^\w\s\-\.]', '', os.path.splitext(filename)[0])
-        name = re.sub(r'[+_]', ' ', name)
-        name = re.sub(r'\s+', ' ', name).strip()
+        name = _UNKNOWN_NAME_CHARS_RE.sub('', base)
+        name = _PLUS_UND_RE.sub(' ', name)
+        name = _WS_RE.sub(' ', name).strip()
     
     # Não usar "Autor Desconhecido" no nome do arquivo
     # Apenas retornar o nome normalizado
@@ -1392,11 +2149,24 @@ def extrair_metadados_ebook(filepath):
     meta = {"titulo": None, "autor": None, "ano": None, "genero": None}
     try:
         if filepath.lower().endswith(".epub"):
-            book = epub.read_epub(filepath)
-            meta["titulo"] = book.get_metadata('DC', 'title')[0][0] if book.get_metadata('DC', 'title') else None
-            meta["autor"] = book.get_metadata('DC', 'creator')[0][0] if book.get_metadata('DC', 'creator') else None
-            meta["ano"] = book.get_metadata('DC', 'date')[0][0][:4] if book.get_metadata('DC', 'date') else None
+            fields = read_epub_dc_fields(filepath)
+            meta["titulo"] = fields['title'][0] if fields['title'] else None
+            meta["autor"] = fields['creator'][0] if fields['creator'] else None
+            meta["ano"] = fields['date'][0][:4] if fields['date'] else None
         elif filepath.lower().endswith(".pdf"):
+            if HAS_PDFIUM:
+                try:
+                    with _PDFIUM_LOCK:
+                        pdf = pdfium.PdfDocument(filepath)
+                        try:
+                            info = pdf.get_metadata_dict()
+                        finally:
+                            pdf.close()
+                    meta["titulo"] = info.get('Title') or None
+                    meta["autor"] = info.get('Author') or None
+                    return meta
+                except Exception:
+                    pass  # PDF que o PDFium não abre: tentar com PyPDF2
             with open(filepath, 'rb') as f:
                 pdf = PdfReader(f)
                 if hasattr(pdf, 'metadata') and pdf.metadata:
@@ -1436,13 +2206,10 @@ def validate_metadata(meta, fonte):
     title_lower = title.lower()
     author_lower = author.lower()
     
-    invalid_titles = ['unknown', 'untitled', 'document', 'file', 'microsoft', 'word']
-    invalid_authors = ['unknown', 'anonymous', 'author', 'user', 'admin', 'system', 't_ms02']
-    
-    if any(invalid in title_lower for invalid in invalid_titles):
+    if _INVALID_TITLE_RE.search(title_lower):
         return False
     
-    if any(invalid in author_lower for invalid in invalid_authors):
+    if _INVALID_AUTHOR_RE.search(author_lower):
         return False
     
     return True
@@ -1475,6 +2242,14 @@ def apply_text_normalization(meta, remover_acentos_flag, limpar_caracteres_flag)
     
     return result
 
+# Threads para consultar as fontes de metadados ao mesmo tempo
+# (Google Books e Open Library para cada thread de identificação, ver PIPELINE_WORKERS)
+FONTES_WORKERS = 32
+# Open Library só é consultada se o Google Books não responder neste prazo
+# (ou não trouxer resultado aceitável): respostas rápidas ou do cache em
+# disco não gastam uma requisição numa API de limite mais apertado
+OPEN_LIBRARY_HEDGE_SECONDS = 0.3
+
 def buscar_metadados_inteligente(titulo, autor, api_key=None):
     """Busca em múltiplas fontes com fallback inteligente"""
     
@@ -1484,10 +2259,27 @@ def buscar_metadados_inteligente(titulo, autor, api_key=None):
     if cached:
         return cached
     
-    # 2. Tentar Google Books (com tratamento de limite)
+    return single_flight(cache_key, _buscar_metadados_fontes, cache_key, titulo, autor, api_key)
+
+def _buscar_metadados_fontes(cache_key, titulo, autor, api_key=None):
+    """Consulta as fontes em ordem e grava o primeiro resultado aceito no cache"""
+    # Outra thread pode ter concluído a mesma consulta entre a leitura acima e agora
+    cached = get_cached_data(cache_key)
+    if cached:
+        return cached
+    
+    # 2. Tentar Google Books (com tratamento de limite). Se ele demorar, a Open
+    # Library sai em paralelo para não somar as duas latências (a prioridade
+    # continua a mesma)
+    google = shared_thread_pool("fontes", FONTES_WORKERS).submit(buscar_google_books, titulo, autor, api_key)
+    open_library = None
+    if not wait([google], timeout=OPEN_LIBRARY_HEDGE_SECONDS).done:
+        open_library = shared_thread_pool("fontes", FONTES_WORKERS).submit(buscar_open_library, titulo, autor)
     try:
-        resultado = buscar_google_books(titulo, autor, api_key)
+        resultado = google.result()
         if resultado and resultado.get('score', 0) > 0.4:
+            if open_library:
+                open_library.cancel()  # ainda na fila: não precisa mais sair
             set_cached_data(cache_key, resultado)
             return resultado
     except requests.exceptions.HTTPError as e:
@@ -1496,7 +2288,7 @@ def buscar_metadados_inteligente(titulo, autor, api_key=None):
             # Continuar para outros métodos
     
     # 3. Tentar Open Library
-    resultado = buscar_open_library(titulo, autor)
+    resultado = open_library.result() if open_library else buscar_open_library(titulo, autor)
     if resultado and resultado.get('score', 0) > 0.4:
         set_cached_data(cache_key, resultado)
         return resultado
@@ -1529,7 +2321,7 @@ def buscar_google_custom_search(titulo, autor, api_key=None, search_engine_id=No
             'num': 3
         }
         
-        response = requests.get(url, params=params, timeout=15)
+        response = http_get(url, params=params, timeout=15)
         if response.status_code == 200:
             data = response.json()
             if 'items' in data:
@@ -1554,7 +2346,7 @@ def buscar_isbndb(titulo, autor, api_key=None):
             'Content-Type': 'application/json'
         }
         
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_get(url, headers=headers, timeout=15)
         if response.status_code == 200:
             data = response.json()
             if 'books' in data and len(data['books']) > 0:
@@ -1571,11 +2363,136 @@ def buscar_isbndb(titulo, autor, api_key=None):
         pass
     return None
 
+def _google_title(item):
+    return item.get("volumeInfo", {}).get("title", "")
+
+def _google_authors(item):
+    return item.get("volumeInfo", {}).get("authors", [])
+
+def _openlib_title(doc):
+    return doc.get("title", "")
+
+def _openlib_authors(doc):
+    return doc.get("author_name", [])
+
+def _best_match(candidates, titulo, autor, get_title, get_authors):
+    """Melhor candidato para título/autor: (candidato, score).
+
+    Título pesa 0.7 e autor 0.3; empates ficam com o título mais parecido
+    caractere a caractere. get_title/get_authors leem os campos de cada fonte.
+    """
+    best_item = None
+    best_score = 0
+    # Tokens da consulta calculados uma vez para todos os candidatos
+    titulo_tokens = token_set(titulo) if titulo else frozenset()
+    autor_tokens = token_set(autor) if autor else frozenset()
+    
+    best_tie = None
+    
+    for item in candidates:
+        item_title = get_title(item)
+        item_authors = get_authors(item)
+        
+        score = 0
+        if titulo and item_title:
+            title_similarity = token_score_pre(titulo_tokens, item_title)
+            score += title_similarity * 0.7
+        
+        if autor and item_authors:
+            author_similarity = best_author_score(autor_tokens, item_authors)
+            score += author_similarity * 0.3
+        
+        if score > best_score:
+            best_score = score
+            best_item = item
+            best_tie = None
+        elif score == best_score and best_item is not None and titulo:
+            # Empate: ficar com o título mais parecido caractere a caractere
+            if best_tie is None:
+                best_tie = trigram_similarity(titulo, get_title(best_item) or "")
+            tie = trigram_similarity(titulo, item_title or "")
+            if tie > best_tie:
+                best_item, best_tie = item, tie
+    return best_item, best_score
+
+def _best_match_query(candidates, query, get_title, get_authors):
+    """Melhor candidato para uma consulta livre, comparada com "título autores": (candidato, score)"""
+    best = None
+    best_score = 0.0
+    query_tokens = token_set(query) if query else frozenset()
+    for item in candidates:
+        full = f"{get_title(item) or ''} {' '.join(get_authors(item) or [])}"
+        score = token_score_pre(query_tokens, full)
+        if score > best_score:
+            best_score = score
+            best = item
+    return best, best_score
+
+def _google_volume_result(volume, score):
+    """Resultado no formato das buscas a partir de um volumeInfo do Google Books"""
+    # Extrair ano corretamente
+    published_date = volume.get("publishedDate", "")
+    year = None
+    if published_date:
+        year_match = _YEAR4_PREFIX_RE.search(published_date)
+        if year_match:
+            year = year_match.group(1)
+    
+    return {
+        "title": volume.get("title"),
+        "authors": volume.get("authors", []),
+        "publishedDate": year,
+        "categories": volume.get("categories", []),
+        "imageLinks": volume.get("imageLinks", {}),
+        "fonte": "Google Books",
+        "score": score
+    }
+
+# Catálogo por autor (ver prepare_author_catalogs): uma consulta inauthor:
+# traz até 40 volumes e atende vários livros do mesmo autor sem ida à rede.
+# Só um acerto quase exato dispensa a busca por título: no catálogo estão os
+# outros livros do autor, e um título parecido da mesma série passaria de 0.3
+AUTHOR_CATALOG_MAX_RESULTS = 40
+AUTHOR_CATALOG_MIN_SCORE = 0.9
+# O catálogo só é baixado depois desta quantidade de buscas por título do
+# mesmo autor, e se ainda houver livros dele no lote: livros resolvidos pelo
+# ISBN nem chegam aqui, e não gastam a consulta extra
+AUTHOR_CATALOG_AFTER_MISSES = 2
+# Campos de volumeInfo guardados no catálogo (os usados por _google_volume_result)
+_CATALOG_VOLUME_FIELDS = ("title", "authors", "publishedDate", "categories", "imageLinks")
+_AUTHOR_CATALOG_LOCK = threading.Lock()
+_AUTHOR_CATALOG: Dict[str, list] = {}  # autor (minúsculas) -> volumes resumidos
+_AUTHOR_BOOKS = collections.Counter()   # autor -> livros no lote atual
+_AUTHOR_MISSES = collections.Counter()  # autor -> buscas por título feitas na rede
+
+def _author_catalog(autor, api_key=None):
+    """Catálogo do autor para o lote atual, baixado sob demanda (ou None)"""
+    key = autor.lower()
+    with _AUTHOR_CATALOG_LOCK:
+        catalog = _AUTHOR_CATALOG.get(key)
+        if catalog is not None:
+            return catalog
+        _AUTHOR_MISSES[key] += 1
+        misses = _AUTHOR_MISSES[key]
+        if misses < AUTHOR_CATALOG_AFTER_MISSES or _AUTHOR_BOOKS[key] <= misses:
+            return None
+    catalog = single_flight(f"catalogo:{key}", _google_author_catalog, autor, api_key)
+    with _AUTHOR_CATALOG_LOCK:
+        # Só guarda se o lote não foi reiniciado durante a consulta
+        if _AUTHOR_BOOKS[key]:
+            _AUTHOR_CATALOG[key] = catalog
+    return catalog
+
 def buscar_google_books(titulo, autor, api_key=None):
     """Consulta Google Books API usando título e autor de forma inteligente"""
     try:
         # Se temos tanto título quanto autor, fazer busca específica
         if titulo and autor and autor != "Autor Desconhecido":
+            catalog = _author_catalog(autor, api_key)
+            if catalog:
+                best_item, best_score = _best_match(catalog, titulo, autor, _google_title, _google_authors)
+                if best_item and best_score >= AUTHOR_CATALOG_MIN_SCORE:
+                    return _google_volume_result(best_item["volumeInfo"], best_score)
             # Tentar busca exata primeiro
             query = f'intitle:"{titulo}" inauthor:"{autor}"'
         elif titulo:
@@ -1589,56 +2506,52 @@ def buscar_google_books(titulo, autor, api_key=None):
         if api_key:
             url += f"&key={api_key}"
         
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
+        data = http_get_json_cached(url, is_empty=_no_items, timeout=15)
+        if data is not None:
             if "items" in data and len(data["items"]) > 0:
-                best_item = None
-                best_score = 0
-                
-                for item in data["items"]:
-                    volume_info = item.get("volumeInfo", {})
-                    item_title = volume_info.get("title", "").lower()
-                    item_authors = volume_info.get("authors", [])
-                    
-                    score = 0
-                    if titulo and item_title:
-                        title_similarity = token_score(titulo.lower(), item_title)
-                        score += title_similarity * 0.7
-                    
-                    if autor and item_authors:
-                        author_similarity = max([token_score(autor.lower(), auth.lower()) for auth in item_authors] or [0])
-                        score += author_similarity * 0.3
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_item = item
-                
+                best_item, best_score = _best_match(data["items"], titulo, autor, _google_title, _google_authors)
                 if best_item and best_score > 0.3:
-                    volume = best_item["volumeInfo"]
-                    
-                    # Extrair ano corretamente
-                    published_date = volume.get("publishedDate", "")
-                    year = None
-                    if published_date:
-                        year_match = re.search(r'(\d{4})', published_date)
-                        if year_match:
-                            year = year_match.group(1)
-                    
-                    return {
-                        "title": volume.get("title"),
-                        "authors": volume.get("authors", []),
-                        "publishedDate": year,
-                        "categories": volume.get("categories", []),
-                        "imageLinks": volume.get("imageLinks", {}),
-                        "fonte": "Google Books",
-                        "score": best_score
-                    }
+                    return _google_volume_result(best_item["volumeInfo"], best_score)
         return None
     except Exception as e:
         print(f"Erro Google Books API: {e}")
         return None
 
+def _google_author_catalog(autor, api_key=None):
+    """Volumes do autor no Google Books (uma consulta inauthor:, até 40 itens)"""
+    url = (f'https://www.googleapis.com/books/v1/volumes?q=inauthor:"{autor}"'
+           f'&maxResults={AUTHOR_CATALOG_MAX_RESULTS}')
+    if api_key:
+        url += f"&key={api_key}"
+    try:
+        data = http_get_json_cached(url, is_empty=_no_items, timeout=15)
+    except Exception as e:
+        print(f"Erro Google Books API: {e}")
+        return []
+    # Só os campos usados no ranking e no resultado: o volume completo
+    # (descrição, saleInfo, accessInfo...) não fica em memória
+    catalog = []
+    for item in (data or {}).get("items") or []:
+        volume = item.get("volumeInfo") or {}
+        catalog.append({"volumeInfo": {k: volume[k] for k in _CATALOG_VOLUME_FIELDS if k in volume}})
+    return catalog
+
+def prepare_author_catalogs(paths):
+    """Reinicia os catálogos por autor para um novo lote e conta, pelo nome
+    dos arquivos, quantos livros de cada autor há nele (sem acessar a rede)"""
+    counts = collections.Counter()
+    for path in paths:
+        name = clean_search_query_nome_arquivo(os.path.splitext(os.path.basename(path))[0])
+        _, autor = extract_title_author_from_filename(name)
+        if autor and autor != "Autor Desconhecido":
+            counts[autor.lower()] += 1
+    with _AUTHOR_CATALOG_LOCK:
+        _AUTHOR_CATALOG.clear()
+        _AUTHOR_MISSES.clear()
+        _AUTHOR_BOOKS.clear()
+        _AUTHOR_BOOKS.update({k: n for k, n in counts.items() if n > 1})
+        return len(_AUTHOR_BOOKS)
+
 def buscar_com_query_generica(query, api_key=None):
     """Busca genérica que tenta extrair título e autor da query"""
     # Tentar extrair título e autor da query
@@ -1658,6 +2571,20 @@ def buscar_com_query_generica(query, api_key=None):
     # Se não conseguiu separar, buscar como título geral
     return buscar_google_books(query, None, api_key)
 
+def _openlib_doc_result(doc, score):
+    """Resultado no formato das buscas a partir de um doc do search.json da Open Library"""
+    return {
+        "title": doc.get("title"),
+        "authors": doc.get("author_name", []),
+        "publishedDate": str(doc.get("first_publish_year")) if doc.get("first_publish_year") else None,
+        "categories": doc.get("subject", [])[:3] if doc.get("subject") else [],
+        "imageLinks": {
+            "thumbnail": f"https://covers.openlibrary.org/b/id/{doc.get('cover_i')}-M.jpg" if doc.get('cover_i') else None
+        },
+        "fonte": "Open Library",
+        "score": score
+    }
+
 def buscar_open_library(titulo, autor):
     """Consulta Open Library com mapeamento correto"""
     try:
@@ -1669,54 +2596,48 @@ def buscar_open_library(titulo, autor):
             query += f" {autor}"
             
         url = f"https://openlibrary.org/search.json?q={query}&limit=5"
-        response = requests.get(url, timeout=15)
-        if response.status_code == 200:
-            data = response.json()
+        data = http_get_json_cached(url, is_empty=_no_docs, timeout=15)
+        if data is not None:
             if "docs" in data and len(data["docs"]) > 0:
                 # Encontrar o melhor match
-                best_doc = None
-                best_score = 0
-                
-                for doc in data["docs"]:
-                    doc_title = doc.get("title", "").lower()
-                    doc_authors = doc.get("author_name", [])
-                    
-                    score = 0
-                    if titulo and doc_title:
-                        title_similarity = token_score(titulo.lower(), doc_title)
-                        score += title_similarity * 0.7
-                    
-                    if autor and doc_authors:
-                        author_similarity = max([token_score(autor.lower(), auth.lower()) for auth in doc_authors] or [0])
-                        score += author_similarity * 0.3
-                    
-                    if score > best_score:
-                        best_score = score
-                        best_doc = doc
+                best_doc, best_score = _best_match(data["docs"], titulo, autor, _openlib_title, _openlib_authors)
                 
                 if best_doc and best_score > 0.3:
-                    return {
-                        "title": best_doc.get("title"),
-                        "authors": best_doc.get("author_name", []),
-                        "publishedDate": str(best_doc.get("first_publish_year")) if best_doc.get("first_publish_year") else None,
-                        "categories": best_doc.get("subject", [])[:3] if best_doc.get("subject") else [],
-                        "imageLinks": {
-                            "thumbnail": f"https://covers.openlibrary.org/b/id/{best_doc.get('cover_i')}-M.jpg" if best_doc.get('cover_i') else None
-                        },
-                        "fonte": "Open Library",
-                        "score": best_score
-                    }
+                    return _openlib_doc_result(best_doc, best_score)
         return None
     except Exception as e:
         print(f"Erro Open Library: {e}")
         return None
 
+JPEG_MAGIC = b'\xff\xd8\xff'
+# Capas são gravadas em blocos à medida que chegam, sem a resposta inteira na memória
+COVER_CHUNK_SIZE = 64 * 1024
+
+def _write_chunks(chunks, caminho, head=b''):
+    """Grava `head` e os blocos seguintes do corpo da resposta; apaga o
+    arquivo parcial se a transferência falhar no meio"""
+    try:
+        with open(caminho, 'wb') as f:
+            f.write(head)
+            for chunk in chunks:
+                f.write(chunk)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(caminho)
+        raise
+
 def baixar_capa(url, caminho, fonte):
     """Baixa capa do livro"""
     try:
-        response = requests.get(url, stream=True, timeout=15)
+        response = http_get(url, stream=True, timeout=15)
         if response.status_code == 200:
-            image = Image.open(BytesIO(response.content))
+            chunks = response.iter_content(COVER_CHUNK_SIZE)
+            head = next(chunks, b'')
+            # Capas já em JPEG são gravadas como vieram, sem decodificar/recodificar
+            if head[:3] == JPEG_MAGIC:
+                _write_chunks(chunks, caminho, head)
+                return True, fonte
+            image = Image.open(BytesIO(head + b''.join(chunks)))
             if image.mode in ('RGBA', 'LA'):
                 image = image.convert('RGB')
             image.save(caminho, 'JPEG', quality=85)
@@ -1750,33 +2671,111 @@ def extract_local_metadata(path, ext):
     
     return metadata
 
+# Campos Dublin Core usados do pacote OPF
+_EPUB_DC_FIELDS = ('title', 'creator', 'date', 'subject', 'identifier')
+_DC_NS = '{http://purl.org/dc/elements/1.1/}'
+_OPF_ROOTFILE_TAG = './/{urn:oasis:names:tc:opendocument:xmlns:container}rootfile'
+
+@functools.lru_cache(maxsize=64)
+def _read_epub_opf(path, size, mtime_ns):
+    """Lê apenas container.xml e o .opf do ZIP; memoizado por (caminho, tamanho, mtime)"""
+    with zipfile.ZipFile(path) as z:
+        container = ET.fromstring(z.read('META-INF/container.xml'))
+        opf_path = container.find(_OPF_ROOTFILE_TAG).get('full-path')
+        opf = ET.fromstring(z.read(opf_path))
+    fields = {name: [] for name in _EPUB_DC_FIELDS}
+    for el in opf.iter():
+        tag = el.tag
+        if isinstance(tag, str) and tag.startswith(_DC_NS) and el.text:
+            values = fields.get(tag[len(_DC_NS):])
+            if values is not None:
+                values.append(el.text)
+    return {name: tuple(values) for name, values in fields.items()}
+
+def read_epub_dc_fields(path: str) -> Dict[str, Tuple[str, ...]]:
+    """Campos Dublin Core do EPUB como {campo: (valores...)}.
+
+    Lê só o OPF (alguns KB) em vez de todo o livro; o ebooklib fica como
+    alternativa para EPUBs malformados.
+    """
+    try:
+        st = os.stat(path)
+        return _read_epub_opf(path, st.st_size, st.st_mtime_ns)
+    except Exception:
+        if not HAS_EPUB:
+            raise
+    book = epub.read_epub(path)
+    return {name: tuple(v[0] for v in book.get_metadata('DC', name) if v and v[0])
+            for name in _EPUB_DC_FIELDS}
+
 def read_epub_metadata(path: str) -> Dict[str, Any]:
     """Lê metadados de arquivos EPUB"""
     data: Dict[str, Any] = {}
-    if not HAS_EPUB:
-        return data
     try:
-        book = epub.read_epub(path)
-        titles = book.get_metadata('DC', 'title')
-        if titles:
-            data['title'] = normalize_spaces(' '.join([t[0] for t in titles if t and t[0]]))
-        authors = book.get_metadata('DC', 'creator')
-        if authors:
-            auths = [a[0] for a in authors if a and a[0]]
-            data['authors'] = [normalize_spaces(a) for a in auths]
-        dates = book.get_metadata('DC', 'date')
-        if dates and dates[0] and dates[0][0]:
-            data['publishedDate'] = year_from_date_str(str(dates[0][0]))
-        subjects = book.get_metadata('DC', 'subject')
-        if subjects:
-            data['categories'] = [normalize_spaces(s[0]) for s in subjects if s and s[0]]
+        fields = read_epub_dc_fields(path)
+        if fields['title']:
+            data['title'] = normalize_spaces(' '.join(fields['title']))
+        if fields['creator']:
+            data['authors'] = [normalize_spaces(a) for a in fields['creator']]
+        if fields['date']:
+            data['publishedDate'] = year_from_date_str(str(fields['date'][0]))
+        if fields['subject']:
+            data['categories'] = [normalize_spaces(s) for s in fields['subject']]
     except Exception as e:
         print(f"Erro ao ler EPUB {path}: {e}")
     return data
 
+def _title_from_page_text(page_text):
+    """Primeira linha com cara de título nas 10 primeiras linhas da página"""
+    if not page_text:
+        return None
+    for line in page_text.split('\n')[:10]:
+        line = line.strip()
+        if (len(line) > 10 and len(line) < 100 and 
+            not line.isdigit() and 
+            not _ALL_DIGITS_RE.match(line) and
+            not _ALL_UPPER_RE.match(line)):  # Não tudo maiúsculo
+            return line[:80]  # Limitar tamanho
+    return None
+
+def read_pdf_metadata_pdfium(path: str) -> Dict[str, Any]:
+    """Lê Title/Author (e, na falta do título, a primeira página) via PDFium"""
+    data: Dict[str, Any] = {}
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(path)
+        try:
+            info = pdf.get_metadata_dict()
+            first_page_text = None
+            if not str(info.get('Title') or '').strip() and len(pdf) > 0:
+                page = pdf[0]
+                textpage = page.get_textpage()
+                try:
+                    first_page_text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                    page.close()
+        finally:
+            pdf.close()
+    title = str(info.get('Title') or '').strip()
+    author = str(info.get('Author') or '').strip()
+    if title:
+        data['title'] = normalize_spaces(title)
+    if author:
+        data['authors'] = [normalize_spaces(author)]
+    if first_page_text is not None:
+        title = _title_from_page_text(first_page_text)
+        if title:
+            data['title'] = title
+    return data
+
 def read_pdf_metadata(path: str) -> Dict[str, Any]:
     """Lê metadados de arquivos PDF com tratamento de erro robusto"""
     data: Dict[str, Any] = {}
+    if HAS_PDFIUM:
+        try:
+            return read_pdf_metadata_pdfium(path)
+        except Exception as e:
+            print(f"PDFium não abriu {path}, usando PyPDF2: {e}")
     if not HAS_PDF:
         return data
     
@@ -1804,20 +2803,12 @@ def read_pdf_metadata(path: str) -> Dict[str, Any]:
                             data['authors'] = [normalize_spaces(str(info.author))]
                 
                 # Se não encontrou metadados, tentar extrair da primeira página
-                if not data.get('title') and len(reader.pages) > 0:
+                # (PDF só de imagens não tem texto: não descomprimir a página à toa)
+                if not data.get('title') and len(reader.pages) > 0 and pdf_may_have_text(path):
                     try:
-                        page_text = reader.pages[0].extract_text()
-                        if page_text:
-                            # Procurar título nas primeiras linhas
-                            lines = page_text.split('\n')
-                            for line in lines[:10]:  # Primeiras 10 linhas
-                                line = line.strip()
-                                if (len(line) > 10 and len(line) < 100 and 
-                                    not line.isdigit() and 
-                                    not re.match(r'^\d+$', line) and
-                                    not re.match(r'^[A-Z\s]+$', line)):  # Não tudo maiúsculo
-                                    data['title'] = line[:80]  # Limitar tamanho
-                                    break
+                        title = _title_from_page_text(reader.pages[0].extract_text())
+                        if title:
+                            data['title'] = title
                     except Exception as page_error:
                         print(f"Erro ao extrair texto da página: {page_error}")
                         
@@ -1833,6 +2824,22 @@ def read_pdf_metadata(path: str) -> Dict[str, Any]:
     
     return data
 
+# Padrões de metadados em PDF: (campo, regex) para o fallback por bytes brutos.
+# Os marcadores são ASCII: a busca roda direto nos bytes e só o valor
+# encontrado é decodificado
+_PDF_FALLBACK_RES = (
+    ('title', re.compile(rb'/Title\s*\(([^)]+)\)')),
+    ('authors', re.compile(rb'/Author\s*\(([^)]+)\)')),
+    ('title', re.compile(rb'Title:\s*(.*?)\n')),
+    ('authors', re.compile(rb'Author:\s*(.*?)\n')),
+)
+_PDF_SIMPLE_TITLE_RE = re.compile(rb'Title[:\s]*([^\n\r]+)', re.IGNORECASE)
+_PDF_SIMPLE_AUTHOR_RE = re.compile(rb'Author[:\s]*([^\n\r]+)', re.IGNORECASE)
+
+def _pdf_field_text(raw):
+    """Valor de um campo casado nos bytes do PDF, como texto normalizado"""
+    return normalize_spaces(raw.decode('utf-8', errors='ignore'))
+
 def try_pdf_fallback(path):
     """Tenta método alternativo para PDFs problemáticos"""
     data = {}
@@ -1841,33 +2848,24 @@ def try_pdf_fallback(path):
         with open(path, 'rb') as f:
             # Ler apenas os primeiros bytes para evitar problemas
             content = f.read(50000)  # 50KB
-            text = content.decode('utf-8', errors='ignore')
             
-            # Padrões de metadados em PDF
-            patterns = [
-                r'/Title\s*\(([^)]+)\)',
-                r'/Author\s*\(([^)]+)\)',
-                r'Title:\s*(.*?)\n',
-                r'Author:\s*(.*?)\n',
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if 'Title' in pattern and not data.get('title'):
-                        data['title'] = normalize_spaces(match)
-                    elif 'Author' in pattern and not data.get('authors'):
-                        data['authors'] = [normalize_spaces(match)]
+            for key, rx in _PDF_FALLBACK_RES:
+                for m in rx.finditer(content):
+                    if data.get(key):
+                        break  # campo já preenchido: dispensar o resto das ocorrências
+                    value = _pdf_field_text(m.group(1))
+                    data[key] = value if key == 'title' else [value]
             
             # Se não encontrou, procurar texto que pareça título
-            if not data.get('title'):
+            # (num PDF sem fontes as "linhas" dos bytes brutos são só imagem)
+            if not data.get('title') and pdf_may_have_text(path):
                 # Procurar por linhas com texto significativo
-                lines = text.split('\n')
+                lines = content.decode('utf-8', errors='ignore').split('\n')
                 for line in lines[:50]:  # Primeiras 50 linhas
                     line = line.strip()
                     if (len(line) > 10 and len(line) < 100 and
                         not line.isdigit() and
-                        not re.match(r'^[\d\W]+$', line)):
+                        not _NO_LETTERS_RE.match(line)):
                         data['title'] = line[:80]
                         break
     
@@ -1883,16 +2881,15 @@ def try_pdf_fallback_simple(path):
         # Apenas ler os primeiros bytes e procurar padrões simples
         with open(path, 'rb') as f:
             content = f.read(2000)  # Apenas 2KB
-            text = content.decode('utf-8', errors='ignore')
             
             # Procurar padrões muito básicos
-            title_match = re.search(r'Title[:\s]*([^\n\r]+)', text, re.IGNORECASE)
-            author_match = re.search(r'Author[:\s]*([^\n\r]+)', text, re.IGNORECASE)
+            title_match = _PDF_SIMPLE_TITLE_RE.search(content)
+            author_match = _PDF_SIMPLE_AUTHOR_RE.search(content)
             
             if title_match:
-                data['title'] = normalize_spaces(title_match.group(1))
+                data['title'] = _pdf_field_text(title_match.group(1))
             if author_match:
-                data['authors'] = [normalize_spaces(author_match.group(1))]
+                data['authors'] = [_pdf_field_text(author_match.group(1))]
     
     except:
         pass  # Ignorar qualquer erro no fallback simples
@@ -1911,22 +2908,12 @@ def google_books_search(query: str, api_key: Optional[str] = None, lang: Optiona
     if api_key:
         params["key"] = api_key
     try:
-        r = requests.get(base, params=params, timeout=20)
+        r = http_get(base, params=params, timeout=20)
         r.raise_for_status()
         data = r.json()
         items = data.get('items') or []
-        best = None
-        best_score = 0.0
-        for it in items:
-            info = it.get('volumeInfo', {})
-            title = info.get('title') or ''
-            authors = info.get('authors') or []
-            full = f"{title} {' '.join(authors)}"
-            score = token_score(full, query)
-            if score > best_score:
-                best_score = score
-                best = info
-        return best
+        best, _ = _best_match_query(items, query, _google_title, _google_authors)
+        return best.get('volumeInfo', {}) if best else None
     except Exception as e:
         print(f"Erro Google Books search: {e}")
         return None
@@ -1935,20 +2922,11 @@ def open_library_search(query: str) -> Optional[Dict[str, Any]]:
     """Busca na Open Library"""
     url = "https://openlibrary.org/search.json"
     try:
-        r = requests.get(url, params={"q": query, "limit": 5}, timeout=20)
+        r = http_get(url, params={"q": query, "limit": 5}, timeout=20)
         r.raise_for_status()
         data = r.json()
         docs = data.get('docs') or []
-        best = None
-        best_score = 0.0
-        for d in docs:
-            title = d.get('title') or ''
-            authors = d.get('author_name') or []
-            full = f"{title} {' '.join(authors)}"
-            score = token_score(full, query)
-            if score > best_score:
-                best_score = score
-                best = d
+        best, _ = _best_match_query(docs, query, _openlib_title, _openlib_authors)
         if not best:
             return None
         norm = {
@@ -1969,6 +2947,19 @@ def open_library_search(query: str) -> Optional[Dict[str, Any]]:
         print(f"Erro Open Library search: {e}")
         return None
 
+def _merge_unique(first: List[str], second: List[str]) -> List[str]:
+    """Junta as listas sem repetir nomes (sem diferenciar maiúsculas), na ordem
+    em que aparecem e com a grafia da primeira ocorrência"""
+    seen = set()
+    out = []
+    for values in (first, second):
+        for value in values:
+            key = value.casefold()
+            if key not in seen:
+                seen.add(key)
+                out.append(value)
+    return out
+
 def merge_metadata(local: Dict[str, Any], api: Dict[str, Any]) -> Dict[str, Any]:
     """Mescla metadados locais com dados da API de forma inteligente"""
     merged = local.copy() if local else {}
@@ -1985,8 +2976,7 @@ def merge_metadata(local: Dict[str, Any], api: Dict[str, Any]) -> Dict[str, Any]
         api_authors = api.get('authors', [])
         local_authors = merged.get('authors', [])
         if api_authors:
-            all_authors = list(dict.fromkeys(local_authors + api_authors))
-            merged['authors'] = all_authors
+            merged['authors'] = _merge_unique(local_authors, api_authors)
         
         # Year - preferir API
         api_year = api.get('publishedDate')
@@ -1997,8 +2987,7 @@ def merge_metadata(local: Dict[str, Any], api: Dict[str, Any]) -> Dict[str, Any]
         api_categories = api.get('categories', [])
         local_categories = merged.get('categories', [])
         if api_categories:
-            all_categories = list(dict.fromkeys(local_categories + api_categories))
-            merged['categories'] = all_categories
+            merged['categories'] = _merge_unique(local_categories, api_categories)
         
         # ImageLinks - preferir API
         api_images = api.get('imageLinks', {})
@@ -2032,6 +3021,32 @@ def buscar_simulacao(titulo, autor):
     return None
 # ------------------------------ Organização e arquivo ------------------------------
 
+# Diretórios de destino já criados nesta execução (evita um makedirs por arquivo)
+_CREATED_DIRS = set()
+
+def ensure_dir(path: str) -> str:
+    """Cria o diretório uma única vez por execução"""
+    if path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+    return path
+
+def move_path(src: str, dst: str) -> None:
+    """Move src para dst.
+
+    No mesmo disco um os.rename basta (uma chamada, atômica); em qualquer
+    falha (outro dispositivo, destino existente no Windows, pasta removida
+    durante a execução) cai no shutil.move, que copia e apaga.
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        parent = os.path.dirname(dst)
+        if parent and not os.path.isdir(parent):
+            _CREATED_DIRS.discard(parent)
+            ensure_dir(parent)
+        shutil.move(src, dst)
+
 def choose_primary_author(authors: Optional[List[str]]) -> str:
     """Seleciona e formata o autor principal de forma inteligente"""
     if not authors:
@@ -2048,13 +3063,13 @@ def choose_primary_author(authors: Optional[List[str]]) -> str:
             author = f"{parts[1]} {parts[0]}"
     
     # Remover lixo comum
-    author = re.sub(r'\(.*?\)', '', author)  # Remover parênteses
-    author = re.sub(r'\s+', ' ', author).strip()
+    author = _PAREN_RE.sub('', author)  # Remover parênteses
+    author = _WS_RE.sub(' ', author).strip()
     
     # Validar se é um autor plausível
     if (len(author) < 3 or 
         author.lower() in ['unknown', 'anonymous', 'anon', 'none', 'autor desconhecido'] or
-        re.match(r'^[\d\W]+$', author)):
+        _NO_LETTERS_RE.match(author)):
         return "Autor Desconhecido"
     
     return normalize_spaces(author)
@@ -2066,11 +3081,18 @@ def choose_primary_genre(categories: Optional[List[str]]) -> str:
     cats = sorted(categories, key=lambda c: len(c))
     return sanitize_filename(cats[0]) or "Geral"
 
-def build_filename(meta: Dict[str, Any], original_ext: str, pattern: str = "{author} - {title} ({year})") -> str:
-    """Constrói nome do arquivo baseado nos metadados, mantendo a extensão original"""
-    author = choose_primary_author(meta.get('authors'))
+def build_filename(meta: Dict[str, Any], original_ext: str, pattern: str = "{author} - {title} ({year})",
+                   author: Optional[str] = None, year: Optional[str] = None) -> str:
+    """Constrói nome do arquivo baseado nos metadados, mantendo a extensão original.
+
+    `author` e `year` já escolhidos pelo chamador dispensam refazer
+    choose_primary_author/year_from_date_str sobre o dicionário.
+    """
+    if author is None:
+        author = choose_primary_author(meta.get('authors'))
     title = meta.get('title') or "Sem Título"
-    year = year_from_date_str(meta.get('publishedDate')) or "s.d."
+    if year is None:
+        year = year_from_date_str(meta.get('publishedDate')) or "s.d."
     
     # Garantir que a extensão seja a original
     if not original_ext:
@@ -2087,7 +3109,7 @@ def ensure_unique_path(base_dir: str, filename: str) -> str:
     
     duplicates_dir = os.path.join(os.path.dirname(base_dir), 
                                  get_config_value(load_config(), 'Geral', 'duplicates_dirname', '3. Duplicados'))
-    os.makedirs(duplicates_dir, exist_ok=True)
+    ensure_dir(duplicates_dir)
     
     return os.path.join(duplicates_dir, filename)
 
@@ -2102,13 +3124,12 @@ def download_cover(image_links: Dict[str, Any], dest_dir: str, base_name: str, l
             urls.append(u)
     for url in urls:
         try:
-            r = requests.get(url, timeout=20)
+            r = http_get(url, stream=True, timeout=20)
             r.raise_for_status()
-            os.makedirs(dest_dir, exist_ok=True)
+            ensure_dir(dest_dir)
             ext = '.jpg'
             out = os.path.join(dest_dir, sanitize_filename(base_name) + ext)
-            with open(out, 'wb') as f:
-                f.write(r.content)
+            _write_chunks(r.iter_content(COVER_CHUNK_SIZE), out)
             logfn(f"Capa baixada de {fonte}: {out}", "success")
             return out
         except Exception as e:
@@ -2129,7 +3150,139 @@ class ActionLog:
     note: str
     fonte: str
 
+# Colunas do organizacao_log.csv, na ordem dos campos de ActionLog
+ACTION_LOG_FIELDS = ("source_path", "dest_path", "title", "author", "year", "genre", "cover_path", "status", "note", "fonte")
+# Tupla de valores de um ActionLog numa só chamada em C
+action_log_row = operator.attrgetter(*ACTION_LOG_FIELDS)
+# Colunas do biblioteca_index.csv
+INDEX_CSV_FIELDS = ("title", "author", "year", "genre", "relative_path", "cover_relpath", "fonte")
+# Buffer de escrita dos CSVs de log (poucas chamadas de write ao disco)
+CSV_BUFFER_SIZE = 1 << 20
+
+def relpath_under(path, base):
+    """os.path.relpath para caminhos montados com os.path.join(base, ...):
+    corta o prefixo em vez de resolver os dois caminhos ('' se path vazio)"""
+    if not path:
+        return ''
+    prefix = os.path.join(base, '')
+    if base and path.startswith(prefix):
+        return os.path.normpath(path[len(prefix):])
+    return os.path.relpath(path, base)
+
+def open_csv_log(stack, caminho, header, rotulo, logfn):
+    """Abre um CSV de log no ExitStack e grava o cabeçalho; None se falhar"""
+    try:
+        f = stack.enter_context(open(caminho, 'w', newline='', encoding='utf-8-sig', buffering=CSV_BUFFER_SIZE))
+        w = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
+        w.writerow(header)
+        return w
+    except Exception as e:
+        logfn(f"ERRO: Ao salvar {rotulo}: {e}", "error")
+        return None
+
+@dataclass(frozen=True)
+class ProcessOptions:
+    """Opções de organização lidas da configuração uma vez por lote"""
+    out_base: str
+    organize_mode: str
+    pattern: str
+    remover_acentos: bool
+    limpar_caracteres: bool
+
+    @classmethod
+    def from_config(cls, config, out_base):
+        return cls(
+            out_base=out_base,
+            organize_mode=get_config_value(config, 'Geral', 'organize_mode', 'autor'),
+            pattern=get_config_value(config, 'Geral', 'filename_pattern', '{author} - {title} ({year})'),
+            remover_acentos=get_config_value(config, 'Opcoes', 'remover_acentos', 'True').lower() == 'true',
+            limpar_caracteres=get_config_value(config, 'Opcoes', 'limpar_caracteres', 'True').lower() == 'true',
+        )
+
 # ------------------------------ Worker ------------------------------
+# Identificação (leitura, parsing e rede) roda em paralelo; mover/renomear
+# continua serializado numa única thread para evitar corridas no destino.
+# Parsing de PDF (texto das páginas e metadados) é CPU pura: roda em processos, fora do GIL
+PARSE_PROCESS_WORKERS = os.cpu_count() or 1
+
+# Pool de processos de parsing: criado uma vez e reaproveitado entre execuções.
+# Sempre com "spawn": um fork a partir do processo com Tk e várias threads
+# herdaria locks presos por outras threads e poderia travar o filho
+_PARSE_POOL = None
+_PARSE_POOL_LOCK = threading.Lock()
+# Tarefas ainda não concluídas de cada pool, canceladas à mão no encerramento
+# (shutdown(cancel_futures=True) só existe a partir do Python 3.9)
+_PARSE_PENDING = {}
+
+def get_parse_pool():
+    """Pool de processos compartilhado para o parsing de PDFs"""
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if _PARSE_POOL is None:
+            _PARSE_POOL = ProcessPoolExecutor(max_workers=PARSE_PROCESS_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'))
+            _PARSE_PENDING[_PARSE_POOL] = set()
+            atexit.register(shutdown_parse_pool, _PARSE_POOL)
+        return _PARSE_POOL
+
+def shutdown_parse_pool(pool=None):
+    """Encerra o pool de parsing sem esperar tarefas pendentes.
+
+    Com `pool`, só descarta se ainda for o pool atual: várias threads podem
+    ver o mesmo pool quebrado, e apenas a primeira o substitui.
+    """
+    global _PARSE_POOL
+    with _PARSE_POOL_LOCK:
+        if pool is None or pool is _PARSE_POOL:
+            pool, _PARSE_POOL = _PARSE_POOL, None
+        else:
+            pool = None
+        pending = _PARSE_PENDING.pop(pool, ())
+    for future in pending:
+        future.cancel()
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+def _submit_parse(pool, fn, *args):
+    """Envia fn(*args) ao pool, registrando a tarefa até ela terminar"""
+    future = pool.submit(fn, *args)
+    with _PARSE_POOL_LOCK:
+        pending = _PARSE_PENDING.get(pool)
+        if pending is not None:
+            pending.add(future)
+    future.add_done_callback(_discard_parse_future)
+    return future
+
+def _discard_parse_future(future):
+    with _PARSE_POOL_LOCK:
+        for pending in _PARSE_PENDING.values():
+            pending.discard(future)
+
+def iter_book_files(root: str):
+    """Percorre a árvore com os.scandir (sem stat extra por entrada) e produz
+    os caminhos com extensão suportada, na mesma ordem que o os.walk"""
+    stack = [root]
+    while stack:
+        d = stack.pop()
+        try:
+            it = os.scandir(d)
+        except OSError:
+            continue
+        subdirs = []
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir():
+                        # Links para diretórios não são seguidos (como no os.walk)
+                        if not e.is_symlink():
+                            subdirs.append(e.path)
+                        continue
+                except OSError:
+                    pass
+                if os.path.splitext(e.name)[1].lower() in SUPPORTED_EXTS:
+                    yield e.path
+        stack.extend(reversed(subdirs))
+
 # Função principal de processamento de arquivo individual
 def process_file(path: str,
                  out_base: str,
@@ -2153,34 +3306,101 @@ def process_file(path: str,
     
     logfn(f"=== PROCESSANDO: {filename} ===", "info")
     
+    meta = identify_file_metadata(path, ext, api_key, logfn)
+    return organize_identified_file(path, meta, out_base, organize_mode, pattern,
+                                    download_covers, remover_acentos_flag,
+                                    limpar_caracteres_flag, logfn)
+
+def identify_file_metadata(path, ext, api_key, logfn, use_parse_pool=False):
+    """Identifica os metadados do arquivo sem alterar o sistema de arquivos"""
     # 1. Extração de ISBN e busca prioritária
-    isbn_meta = extract_and_search_isbn(path, api_key, logfn)
+    isbn_meta = extract_and_search_isbn(path, api_key, logfn, use_parse_pool)
     if isbn_meta and isbn_meta.get('isbn_found'):
-        return process_successful_metadata(path, out_base, organize_mode, pattern, 
-                                         download_covers, isbn_meta, ext, logfn,
-                                         remover_acentos_flag, limpar_caracteres_flag)
+        return isbn_meta
 
     # 2. Fallback: Metadados locais + API
-    api_meta = extract_and_search_api(path, ext, api_key, logfn)
+    api_meta = extract_and_search_api(path, ext, api_key, logfn, use_parse_pool)
     if api_meta and api_meta.get('api_found'):
-        return process_successful_metadata(path, out_base, organize_mode, pattern,
-                                         download_covers, api_meta, ext, logfn,
-                                         remover_acentos_flag, limpar_caracteres_flag)
+        return api_meta
 
     # 3. Fallback final: Nome do arquivo + API
     filename_meta = extract_and_search_filename(path, api_key, logfn)
     if filename_meta and filename_meta.get('filename_found'):
+        return filename_meta
+
+    return None
+
+def organize_identified_file(path, meta, out_base, organize_mode, pattern,
+                             download_covers, remover_acentos_flag,
+                             limpar_caracteres_flag, logfn) -> ActionLog:
+    """Move o arquivo para o destino conforme os metadados identificados"""
+    ext = os.path.splitext(path)[1].lower()
+    if meta:
         return process_successful_metadata(path, out_base, organize_mode, pattern,
-                                         download_covers, filename_meta, ext, logfn,
+                                         download_covers, meta, ext, logfn,
                                          remover_acentos_flag, limpar_caracteres_flag)
 
-    # 4. Nada encontrado - mover para não localizados
-    return move_to_unknown(path, out_base, filename, logfn)
+    # Nada encontrado - mover para não localizados
+    return move_to_unknown(path, out_base, os.path.basename(path), logfn)
+
+def identify_files_parallel(paths, api_key, stop_flag=None, max_workers=PIPELINE_WORKERS):
+    """Identifica metadados de vários arquivos em paralelo.
+
+    Gera tuplas (path, meta, log_lines, error) na ordem de conclusão. As linhas
+    de log de cada arquivo são acumuladas para que o chamador as reproduza em
+    bloco, e no máximo 2 * max_workers arquivos ficam em andamento. O parsing
+    dos PDFs vai para um pool de processos compartilhado pelas threads.
+    """
+    def task(path):
+        lines = []
+        def logfn(text, tag=""):
+            lines.append((text, tag))
+        logfn(f"=== PROCESSANDO: {os.path.basename(path)} ===", "info")
+        ext = os.path.splitext(path)[1].lower()
+        try:
+            return identify_file_metadata(path, ext, api_key, logfn, use_parse_pool=True), lines, None
+        except Exception as e:
+            return None, lines, e
 
-def extract_and_search_isbn(path, api_key, logfn):
+    paths_iter = iter(paths)
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        try:
+            while True:
+                while len(pending) < 2 * max_workers and not (stop_flag and stop_flag.is_set()):
+                    path = next(paths_iter, None)
+                    if path is None:
+                        break
+                    pending[pool.submit(task, path)] = path
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    yield (path,) + future.result()
+        finally:
+            # Cancelado pelo chamador: descartar o que ainda não começou
+            for future in pending:
+                future.cancel()
+
+def _parse_in_pool(use_pool, fn, path, *args):
+    """fn(path, *args) num processo do pool (só PDFs, onde o custo é CPU)"""
+    if not use_pool or not path.lower().endswith('.pdf'):
+        return fn(path, *args)
+    pool = get_parse_pool()
+    try:
+        return _submit_parse(pool, fn, path, *args).result()
+    except BrokenProcessPool:
+        # Um processo filho morreu, em geral derrubado por este mesmo PDF: o
+        # arquivo não é relido no processo da interface, e o pool é refeito
+        # para os próximos
+        shutdown_parse_pool(pool)
+        raise RuntimeError(f"o processo de leitura do PDF foi encerrado ({os.path.basename(path)})")
+
+def extract_and_search_isbn(path, api_key, logfn, use_parse_pool=False):
     """Extrai ISBN e busca na API"""
     logfn("Extraindo ISBN do arquivo...", "info")
-    extracted_isbn = extract_isbn_rigorous(path)
+    extracted_isbn = _parse_in_pool(use_parse_pool, extract_isbn_rigorous, path)
     
     if not extracted_isbn:
         logfn("ISBN não localizado", "info")
@@ -2198,12 +3418,12 @@ def extract_and_search_isbn(path, api_key, logfn):
     logfn(f"✗ ISBN {extracted_isbn} não retornou resultados válidos", "warning")
     return None
 
-def extract_and_search_api(path, ext, api_key, logfn):
+def extract_and_search_api(path, ext, api_key, logfn, use_parse_pool=False):
     """Extrai metadados locais e busca na API"""
     logfn("Extraindo metadados para consulta API...", "info")
     
     try:
-        local_meta = extract_local_metadata(path, ext)
+        local_meta = _parse_in_pool(use_parse_pool, extract_local_metadata, path, ext)
     except Exception as meta_error:
         logfn(f"⚠️ Erro ao extrair metadados: {meta_error}", "warning")
         return None
@@ -2289,20 +3509,17 @@ def process_successful_metadata(path, out_base, organize_mode, pattern,
     dest_dir = create_destination_dir(out_base, organize_mode, author, genre, logfn)
     
     # Construir nome do arquivo
-    dest_name = build_filename({
-        'authors': [author],
-        'title': title,
-        'publishedDate': year
-    }, ext, pattern=pattern)
+    dest_name = build_filename({'title': title}, ext, pattern=pattern, author=author, year=year)
     
     dest_path = ensure_unique_path(dest_dir, dest_name)
-    logfn(f"Destino: {os.path.relpath(dest_path, out_base)}", "info")
+    logfn(f"Destino: {relpath_under(dest_path, out_base)}", "info")
     
-    # Baixar capa se necessário
-    cover_path = download_cover_if_needed(download_covers, meta, dest_dir, dest_name, logfn)
+    # Baixar capa se necessário (em paralelo com a movimentação do arquivo)
+    cover = shared_thread_pool("capas", COVER_WORKERS).submit(download_cover_if_needed, download_covers, meta, dest_dir, dest_name, logfn)
     
     # Mover arquivo
     status, note = move_file(path, dest_path, meta.get('fonte', 'Desconhecida'), meta.get('isbn'), logfn)
+    cover_path = cover.result()
     
     return ActionLog(
         source_path=path,
@@ -2326,9 +3543,12 @@ def create_destination_dir(out_base, organize_mode, author, genre, logfn):
         dest_dir = os.path.join(out_base, sanitize_filename(genre), sanitize_filename(author))
         logfn(f"Organizando por gênero/autor: {genre}/{author}", "info")
     
-    os.makedirs(dest_dir, exist_ok=True)
+    ensure_dir(dest_dir)
     return dest_dir
 
+# Downloads de capa saem deste pool para correr junto com a movimentação dos arquivos
+COVER_WORKERS = 8
+
 def download_cover_if_needed(download_covers, meta, dest_dir, dest_name, logfn):
     """Baixa capa se necessário e configurado"""
     if not download_covers or not meta.get('imageLinks'):
@@ -2344,11 +3564,11 @@ def download_cover_if_needed(download_covers, meta, dest_dir, dest_name, logfn):
 def move_file(src_path, dest_path, fonte, isbn, logfn):
     """Move o arquivo com tratamento de erro"""
     try:
-        shutil.move(src_path, dest_path)
+        move_path(src_path, dest_path)
         note = f'Fonte: {fonte}'
         if isbn:
             note += f', ISBN: {isbn}'
-        logfn(f"✅ SUCESSO: Movido para {os.path.relpath(dest_path, os.path.dirname(dest_path))}", "success")
+        logfn(f"✅ SUCESSO: Movido para {os.path.basename(dest_path)}", "success")
         return 'moved', note
     except Exception as e:
         logfn(f"❌ ERRO: Falha ao mover arquivo: {e}", "error")
@@ -2360,20 +3580,20 @@ def move_to_unknown(path, out_base, filename, logfn):
     
     config = load_config()
     unknown_dir = get_config_value(config, 'Geral', 'unknown_dirname', '2. Não Localizados')
-    dest_dir = os.path.join(out_base, unknown_dir)
-    os.makedirs(dest_dir, exist_ok=True)
+    dest_dir = ensure_dir(os.path.join(out_base, unknown_dir))
     
     clean_name = normalize_unknown_filename(filename)
     dest_path = os.path.join(dest_dir, clean_name)
+    title = os.path.splitext(filename)[0]
     
     try:
-        shutil.move(path, dest_path)
+        move_path(path, dest_path)
         logfn(f"✗ Movido para: {unknown_dir}/{clean_name}", "warning")
         
         return ActionLog(
             source_path=path,
             dest_path=dest_path,
-            title=os.path.splitext(filename)[0],
+            title=title,
             author="Desconhecido",
             year="s.d.",
             genre="Não Localizado",
@@ -2387,7 +3607,7 @@ def move_to_unknown(path, out_base, filename, logfn):
         return ActionLog(
             source_path=path,
             dest_path=path,
-            title=os.path.splitext(filename)[0],
+            title=title,
             author="Desconhecido",
             year="s.d.",
             genre="Erro",
@@ -2397,8 +3617,163 @@ def move_to_unknown(path, out_base, filename, logfn):
             fonte="Erro"
         )
 
+def find_duplicate_files(paths):
+    """Detecta arquivos com conteúdo idêntico sem ler a maioria deles.
+
+    Só arquivos com tamanho repetido são lidos; destes, só os que também
+    coincidem no início/fim recebem hash completo (reaproveitado do cache
+    enquanto tamanho e mtime não mudarem). Retorna {duplicado: original};
+    fica como original a cópia cujo nome traz autor e título, depois a mais
+    antiga, depois a primeira encontrada.
+    """
+    stats = {}
+    by_size = collections.defaultdict(list)
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if st.st_size:
+            stats[path] = st
+            by_size[st.st_size].append(path)
+    
+    duplicates = {}
+    new_hashes = []
+    for size, group in by_size.items():
+        if len(group) < 2:
+            continue
+        by_partial = collections.defaultdict(list)
+        for path in group:
+            fp = calcular_hash_parcial(path, size)
+            if fp:
+                by_partial[fp].append(path)
+        for same_partial in by_partial.values():
+            if len(same_partial) < 2:
+                continue
+            if size <= 2 * HASH_PARTIAL_SIZE:
+                confirmed = [same_partial]
+            else:
+                by_full = collections.defaultdict(list)
+                for path in same_partial:
+                    mtime = stats[path].st_mtime
+                    h = get_cached_file_hash(path, size, mtime)
+                    if h is None:
+                        h = calcular_hash(path)
+                        if h is None:
+                            continue
+                        new_hashes.append((path, size, mtime, h))
+                    by_full[h].append(path)
+                confirmed = by_full.values()
+            for same in confirmed:
+                if len(same) < 2:
+                    continue
+                original = min(same, key=lambda p: (not extract_metadata_from_filename(os.path.basename(p)).get('authors'),
+                                                    stats[p].st_mtime))
+                for path in same:
+                    if path != original:
+                        duplicates[path] = original
+    
+    set_cached_file_hashes(new_hashes)
+    return duplicates
+
+def move_to_duplicates(path, original, out_base, duplicates_dirname, logfn):
+    """Move um arquivo de conteúdo idêntico a outro para a pasta de duplicados"""
+    filename = os.path.basename(path)
+    base, ext = os.path.splitext(filename)
+    dest_dir = ensure_dir(os.path.join(out_base, duplicates_dirname))
+    
+    dest_path = os.path.join(dest_dir, filename)
+    n = 1
+    while os.path.exists(dest_path):
+        dest_path = os.path.join(dest_dir, f"{base} ({n}){ext}")
+        n += 1
+    
+    try:
+        move_path(path, dest_path)
+        logfn(f"⧉ Duplicado de '{os.path.basename(original)}': movido para {duplicates_dirname}/{os.path.basename(dest_path)}", "warning")
+        status, note = "duplicate", f"Conteúdo idêntico a {original}"
+    except Exception as e:
+        logfn(f"ERRO: Falha ao mover duplicado: {e}", "error")
+        dest_path, status, note = path, "error", str(e)
+    
+    return ActionLog(
+        source_path=path,
+        dest_path=dest_path,
+        title=base,
+        author="",
+        year="",
+        genre="Duplicado",
+        cover_path="",
+        status=status,
+        note=note,
+        fonte="Sistema"
+    )
+
+
+# Linhas inseridas na Treeview por vez; os lotes seguintes entram pelo
+# laço de eventos, então a janela responde mesmo com milhares de arquivos
+TREE_INSERT_BATCH = 300
+# Arquivos lidos por vez ao carregar a pasta de não localizados (idem)
+LOAD_BATCH = 200
+# Cache dos metadados extraídos dos nomes, gravado na própria pasta de não
+# localizados: ao recarregar, só os arquivos novos ou alterados são reprocessados
+UNKNOWN_META_CACHE = '.livrando_meta.json'
+# Incrementar ao mudar as heurísticas de extract_metadata_from_filename:
+# caches gravados com outra versão são descartados
+UNKNOWN_META_CACHE_VERSION = 1
+_META_CACHE_TEXT_FIELDS = ('titulo', 'autor', 'ano')
+
+def _entrada_cache_valida(dados):
+    """Entrada {mtime, titulo, autor, ano} com os tipos esperados"""
+    return (isinstance(dados, dict)
+            and isinstance(dados.get('mtime'), (int, float))
+            and all(isinstance(dados.get(campo), str) for campo in _META_CACHE_TEXT_FIELDS))
+
+def carregar_cache_metadados(pasta):
+    """Lê o cache {filename: {mtime, titulo, autor, ano}} da pasta.
+
+    Arquivo ausente, corrompido ou de outra versão resulta em cache vazio;
+    entradas malformadas são ignoradas (o nome é reprocessado).
+    """
+    try:
+        with open(os.path.join(pasta, UNKNOWN_META_CACHE), 'rb') as f:
+            cache = _json_loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get('versao') != UNKNOWN_META_CACHE_VERSION:
+        return {}
+    arquivos = cache.get('arquivos')
+    if not isinstance(arquivos, dict):
+        return {}
+    return {nome: dados for nome, dados in arquivos.items() if _entrada_cache_valida(dados)}
+
+def salvar_cache_metadados(pasta, cache):
+    """Grava o cache de metadados de forma atômica (arquivo temporário + os.replace)"""
+    caminho = os.path.join(pasta, UNKNOWN_META_CACHE)
+    temp = caminho + '.tmp'
+    try:
+        with open(temp, 'w', encoding='utf-8') as f:
+            f.write(_json_dumps({'versao': UNKNOWN_META_CACHE_VERSION, 'arquivos': cache}))
+        os.replace(temp, caminho)
+    except OSError as e:
+        print(f"Erro ao salvar cache de metadados: {e}")
+        with contextlib.suppress(OSError):
+            os.remove(temp)
+
+# Abridor de arquivos do sistema, escolhido uma vez conforme a plataforma.
+# Popen não espera o programa externo fechar
+if sys.platform.startswith('win'):
+    abrir_no_sistema = os.startfile
+elif sys.platform == 'darwin':
+    def abrir_no_sistema(caminho):
+        subprocess.Popen(['open', caminho])  # macOS
+else:
+    def abrir_no_sistema(caminho):
+        subprocess.Popen(['xdg-open', caminho])  # Linux
 
 class GerenciadorNaoLocalizados(tk.Toplevel):
+    _estilos_prontos = False  # estilo Danger.TButton já registrado no ttk
+
     def __init__(self, parent):
         super().__init__(parent)
         self.title("Gerenciador de Arquivos Não Localizados")
@@ -2412,7 +3787,13 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.deleted_dir = get_config_value(self.config, 'Geral', 'deleted_dirname', '4. Excluidos')
         
         self.arquivos = []
+        self.by_filename = {}  # filename -> item de self.arquivos
         self.dados_editados = {}
+        self._preencher_job = None  # lote agendado de atualizar_lista
+        self._carregar_job = None  # lote agendado de carregar_arquivos
+        self._cache_meta = {}  # filename -> metadados extraídos (UNKNOWN_META_CACHE)
+        self._cache_meta_alterado = False
+        self._processando = False  # processar_arquivos ou consulta à API em andamento
         
         self.create_widgets()
         # Carregar após um delay para não travar a interface
@@ -2449,9 +3830,9 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.tree.column('ano', width=30)
         self.tree.column('extensao', width=10)
         
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(main_frame, orient='vertical', command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Scrollbar (posicionada junto com a lista em mostrar_interface_principal)
+        self.scrollbar = ttk.Scrollbar(main_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
         
         # Frame para botões (2 linhas) - inicialmente escondido
         self.button_frame1 = ttk.Frame(main_frame)
@@ -2467,11 +3848,13 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         # Botões da segunda linha (com destaque para excluir)
         ttk.Button(self.button_frame2, text="📊 Estatísticas", command=self.mostrar_estatisticas).pack(side='left', padx=2)
         ttk.Button(self.button_frame2, text="🗑️ Excluir Selecionados", command=self.excluir_selecionados, style='Danger.TButton').pack(side='left', padx=2)
-        ttk.Button(self.button_frame2, text="❌ Fechar", command=self.destroy).pack(side='right', padx=2)
+        self.botao_fechar = ttk.Button(self.button_frame2, text="❌ Fechar", command=self.destroy)
+        self.botao_fechar.pack(side='right', padx=2)
         
-        # Configurar estilo para botão de excluir
-        style = ttk.Style()
-        style.configure('Danger.TButton', foreground='black', background='#8B0000')
+        # Configurar estilo para botão de excluir (vale para o app todo: uma vez basta)
+        if not GerenciadorNaoLocalizados._estilos_prontos:
+            ttk.Style().configure('Danger.TButton', foreground='black', background='#8B0000')
+            GerenciadorNaoLocalizados._estilos_prontos = True
         
         # Configurar expansão
         main_frame.grid_rowconfigure(1, weight=1)
@@ -2493,48 +3876,95 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
     
     def carregar_arquivos(self):
         """Carrega os arquivos da pasta não localizados com proteção"""
+        # Carga anterior ainda em andamento (Recarregar): recomeçar do zero
+        if self._carregar_job is not None:
+            self.after_cancel(self._carregar_job)
+            self._carregar_job = None
         try:
             unknown_path = os.path.join(self.base_dir, self.unknown_dir)
             if not os.path.exists(unknown_path):
                 self.loading_label.config(text="❌ Pasta não localizados não existe")
                 self.arquivos = []
+                self.by_filename = {}
                 return
             
             self.arquivos = []
-            arquivos = os.listdir(unknown_path)
+            self.by_filename = {}
+            # scandir traz o tipo de cada entrada junto da listagem: sem um stat por arquivo
+            with os.scandir(unknown_path) as it:
+                arquivos = [entry for entry in it
+                            if entry.is_file() and not entry.name.startswith(UNKNOWN_META_CACHE)]
+            
+            # Entradas de arquivos que saíram da pasta são descartadas
+            cache = carregar_cache_metadados(unknown_path)
+            nomes = {entry.name for entry in arquivos}
+            self._cache_meta = {nome: dados for nome, dados in cache.items() if nome in nomes}
+            self._cache_meta_alterado = len(self._cache_meta) != len(cache)
             
             if not arquivos:
                 self.loading_label.config(text="✅ Pasta vazia - Nenhum arquivo não localizado")
                 return
             
             self.loading_label.config(text=f"🔄 Carregando {len(arquivos)} arquivos...")
-            self.update()  # Atualizar a interface
+            self.update_idletasks()  # Só redesenha o rótulo, sem drenar a fila de eventos
             
-            for i, filename in enumerate(arquivos):
-                filepath = os.path.join(unknown_path, filename)
-                if os.path.isfile(filepath):
-                    try:
+            self._carregar_lote(arquivos, 0)
+            
+        except Exception as e:
+            self.loading_label.config(text=f"❌ Erro ao carregar: {str(e)}")
+            messagebox.showerror("Erro", f"Erro ao carregar arquivos: {e}")    
+
+    def _carregar_lote(self, arquivos, inicio):
+        """Extrai os metadados de um lote de LOAD_BATCH arquivos e agenda o
+        próximo, mantendo a janela responsiva durante a carga"""
+        self._carregar_job = None
+        if not self.winfo_exists():
+            return  # janela fechada durante a carga
+        try:
+            fim = inicio + LOAD_BATCH
+            for entry in arquivos[inicio:fim]:
+                filename = entry.name
+                try:
+                    nome_sem_ext, extensao = os.path.splitext(filename)
+                    extensao = extensao.lower()
+                    mtime = entry.stat().st_mtime
+                    cached = self._cache_meta.get(filename)
+                    if cached is not None and cached.get('mtime') == mtime:
+                        titulo, autor, ano = cached['titulo'], cached['autor'], cached['ano']
+                    else:
                         # Extrair metadados do nome do arquivo
-                        nome_sem_ext = os.path.splitext(filename)[0]
-                        metadados = extract_metadata_from_filename(filename)  # AQUI chama a função correta
+                        metadados = extract_metadata_from_filename(filename)
                         
                         # Garantir que os valores não sejam None
                         titulo = metadados.get('title', nome_sem_ext) or nome_sem_ext
                         autores = metadados.get('authors', [])
                         autor = ', '.join(autores) if autores else "Desconhecido"
                         ano = metadados.get('publishedDate', 's.d.') or 's.d.'
-                        
-                        self.arquivos.append({
-                            'filename': filename,
-                            'full_path': filepath,
-                            'titulo': titulo,
-                            'autor': autor,
-                            'ano': ano,
-                            'extensao': os.path.splitext(filename)[1].lower()
-                        })
-                    except Exception as e:
-                        print(f"Erro ao processar {filename}: {e}")
-                        continue
+                        self._cache_meta[filename] = {'mtime': mtime, 'titulo': titulo, 'autor': autor, 'ano': ano}
+                        self._cache_meta_alterado = True
+                    
+                    arquivo = {
+                        'filename': filename,
+                        'full_path': entry.path,
+                        'titulo': titulo,
+                        'autor': autor,
+                        'ano': ano,
+                        'extensao': extensao
+                    }
+                    self.arquivos.append(arquivo)
+                    self.by_filename[filename] = arquivo
+                except Exception as e:
+                    print(f"Erro ao processar {filename}: {e}")
+                    continue
+            
+            if fim < len(arquivos):
+                self.loading_label.config(text=f"🔄 Carregando {fim}/{len(arquivos)} arquivos...")
+                self._carregar_job = self.after(1, self._carregar_lote, arquivos, fim)
+                return
+            
+            if self._cache_meta_alterado:
+                salvar_cache_metadados(os.path.dirname(arquivos[0].path), self._cache_meta)
+                self._cache_meta_alterado = False
             
             # Esconder loading e mostrar interface principal
             self.loading_label.grid_remove()
@@ -2553,9 +3983,7 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.tree.grid(row=1, column=0, columnspan=4, sticky='nsew', padx=(0, 5))
         
         # Mostrar scrollbar
-        scrollbar = ttk.Scrollbar(self.tree.master, orient='vertical', command=self.tree.yview)
-        scrollbar.grid(row=1, column=4, sticky='ns')
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar.grid(row=1, column=4, sticky='ns')
         
         # Mostrar botões
         self.button_frame1.grid(row=2, column=0, columnspan=5, pady=(10, 5), sticky='ew')
@@ -2573,6 +4001,7 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.loading_label.grid()
         self.contador_label.grid_remove()
         self.tree.grid_remove()
+        self.scrollbar.grid_remove()
         self.button_frame1.grid_remove()
         self.button_frame2.grid_remove()
         self.tooltip.grid_remove()
@@ -2588,34 +4017,58 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
     
     def atualizar_lista(self):
         """Atualiza a lista de arquivos na treeview"""
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Preenchimento anterior ainda em andamento: a lista é refeita do zero
+        if self._preencher_job is not None:
+            self.after_cancel(self._preencher_job)
+            self._preencher_job = None
         
-        for arquivo in self.arquivos:
-            # Usar dados editados se existirem
-            if arquivo['filename'] in self.dados_editados:
-                dados = self.dados_editados[arquivo['filename']]
-                self.tree.insert('', 'end', values=(
-                    arquivo['filename'],
-                    dados.get('titulo', arquivo['titulo']),
-                    dados.get('autor', arquivo['autor']),
-                    dados.get('ano', arquivo['ano']),
-                    arquivo['extensao']
-                ), tags=('editado',))
-            else:
-                self.tree.insert('', 'end', values=(
-                    arquivo['filename'],
-                    arquivo['titulo'],
-                    arquivo['autor'],
-                    arquivo['ano'],
-                    arquivo['extensao']
-                ))
+        # Uma única chamada ao Tk para limpar, em vez de um delete por linha
+        self.tree.delete(*self.tree.get_children())
         
         # Configurar tags para estilo
         self.tree.tag_configure('editado', background='#f0f8ff')  # Azul claro para editados
+        
+        # Sem stretch durante a carga: a geometria das colunas é recalculada
+        # uma vez no fim, e não a cada lote inserido
+        for coluna in ('titulo', 'autor'):
+            self.tree.column(coluna, stretch=False)
+        self._preencher_lista(0)
+    
+    def _preencher_lista(self, inicio):
+        """Insere um lote de TREE_INSERT_BATCH linhas e agenda o próximo"""
+        self._preencher_job = None
+        if not self.winfo_exists():
+            return  # janela fechada antes do lote agendado
+        fim = inicio + TREE_INSERT_BATCH
+        insert = self.tree.insert
+        get_editado = self.dados_editados.get
+        for arquivo in self.arquivos[inicio:fim]:
+            filename = arquivo['filename']
+            # Usar dados editados se existirem
+            dados = get_editado(filename)
+            if dados is not None:
+                values = (filename,
+                          dados.get('titulo', arquivo['titulo']),
+                          dados.get('autor', arquivo['autor']),
+                          dados.get('ano', arquivo['ano']),
+                          arquivo['extensao'])
+                tags = ('editado',)
+            else:
+                values = (filename, arquivo['titulo'], arquivo['autor'], arquivo['ano'], arquivo['extensao'])
+                tags = ()
+            # iid = nome do arquivo: as ações leem o nome direto da seleção
+            insert('', 'end', iid=filename, values=values, tags=tags)
+        if fim < len(self.arquivos):
+            self._preencher_job = self.after(1, self._preencher_lista, fim)
+            return
+        for coluna in ('titulo', 'autor'):
+            self.tree.column(coluna, stretch=True)
+        self.tree.update_idletasks()
     
     def excluir_selecionados(self):
         """Move os arquivos selecionados para a pasta de excluídos"""
+        if self._processando:
+            return  # a tecla Delete também chega aqui
         selection = self.tree.selection()
         if not selection:
             messagebox.showwarning("Aviso", "Selecione pelo menos um arquivo para excluir")
@@ -2627,9 +4080,7 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         
         arquivos_excluir = []
         for item_id in selection:
-            item = self.tree.item(item_id)
-            filename = item['values'][0]
-            arquivos_excluir.append(filename)
+            arquivos_excluir.append(item_id)
         
         #REMOVENDO NECESSIDADE DE CONFIRMAÇÃO
         #confirmacao = messagebox.askyesno(
@@ -2643,29 +4094,34 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         
         success_count = 0
         error_count = 0
+        excluidos = set()
         
         for filename in arquivos_excluir:
             try:
                 # Encontrar arquivo
-                for arquivo in self.arquivos[:]:  # Usar cópia para remover durante iteração
-                    if arquivo['filename'] == filename:
-                        src_path = arquivo['full_path']
-                        dest_path = os.path.join(deleted_path, filename)
-                        
-                        # Mover para pasta de excluídos
-                        shutil.move(src_path, dest_path)
-                        
-                        # Remover da lista
-                        self.arquivos.remove(arquivo)
-                        if filename in self.dados_editados:
-                            del self.dados_editados[filename]
-                        
-                        success_count += 1
-                        break
+                arquivo = self.by_filename.get(filename)
+                if arquivo is not None:
+                    src_path = arquivo['full_path']
+                    dest_path = os.path.join(deleted_path, filename)
+                    
+                    # Mover para pasta de excluídos (rename direto no mesmo disco)
+                    move_path(src_path, dest_path)
+                    
+                    excluidos.add(filename)
+                    if filename in self.dados_editados:
+                        del self.dados_editados[filename]
+                    
+                    success_count += 1
             except Exception as e:
                 print(f"Erro ao excluir {filename}: {e}")
                 error_count += 1
         
+        # Remover da lista de uma vez (em vez de um list.remove por arquivo)
+        if excluidos:
+            self.arquivos = [a for a in self.arquivos if a['filename'] not in excluidos]
+            for filename in excluidos:
+                self.by_filename.pop(filename, None)
+        
         # Atualizar interface
         self.atualizar_lista()
         self.atualizar_contador()
@@ -2681,6 +4137,8 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
     
     def on_clique(self, event):
         """Quando clica em uma célula para editar"""
+        if self._processando:
+            return  # lista congelada até o lote em andamento terminar
         region = self.tree.identify("region", event.x, event.y)
         if region == "cell":
             column = self.tree.identify_column(event.x)
@@ -2732,28 +4190,27 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.entry_edit.destroy()
         
         # Obter filename do item
-        values = list(self.tree.item(self.editing_item, 'values'))
-        filename = values[0]
+        filename = self.editing_item
         
         # Encontrar arquivo correspondente
-        for arquivo in self.arquivos:
-            if arquivo['filename'] == filename:
-                # Salvar dados editados
-                if filename not in self.dados_editados:
-                    self.dados_editados[filename] = {
-                        'titulo': arquivo['titulo'],
-                        'autor': arquivo['autor'],
-                        'ano': arquivo['ano']
-                    }
-                
-                # Atualizar valor editado
-                col_name = ['arquivo', 'titulo', 'autor', 'ano', 'extensao'][self.editing_column]
-                self.dados_editados[filename][col_name] = novo_valor
-                
-                # Atualizar lista
-                self.atualizar_lista()
-                self.atualizar_contador()
-                break
+        arquivo = self.by_filename.get(filename)
+        if arquivo is not None:
+            # Salvar dados editados
+            if filename not in self.dados_editados:
+                self.dados_editados[filename] = {
+                    'titulo': arquivo['titulo'],
+                    'autor': arquivo['autor'],
+                    'ano': arquivo['ano']
+                }
+            
+            # Atualizar valor editado
+            col_name = ['arquivo', 'titulo', 'autor', 'ano', 'extensao'][self.editing_column]
+            self.dados_editados[filename][col_name] = novo_valor
+            
+            # Atualizar só a linha editada (sem refazer a lista inteira)
+            self.tree.set(self.editing_item, col_name, novo_valor)
+            self.tree.item(self.editing_item, tags=('editado',))
+            self.atualizar_contador()
         
         self.editing_item = None
         self.editing_column = None
@@ -2766,6 +4223,8 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
     
     def on_tecla(self, event):
         """Handle teclas para navegação rápida"""
+        if self._processando:
+            return
         if event.keysym == 'Delete' and self.tree.selection():
             # Limpar campo quando pressionar Delete
             selection = self.tree.selection()[0]
@@ -2780,25 +4239,15 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         if not selection:
             return
         
-        item = self.tree.item(selection[0])
-        filename = item['values'][0]
+        filename = selection[0]
         
         # Encontrar o arquivo completo
-        for arquivo in self.arquivos:
-            if arquivo['filename'] == filename:
-                try:
-                    os.startfile(arquivo['full_path'])  # Windows
-                except:
-                    try:
-                        import subprocess
-                        subprocess.run(['xdg-open', arquivo['full_path']])  # Linux
-                    except:
-                        try:
-                            import subprocess
-                            subprocess.run(['open', arquivo['full_path']])  # macOS
-                        except:
-                            messagebox.showerror("Erro", "Não foi possível abrir o arquivo")
-                break
+        arquivo = self.by_filename.get(filename)
+        if arquivo is not None:
+            try:
+                abrir_no_sistema(arquivo['full_path'])
+            except OSError:
+                messagebox.showerror("Erro", "Não foi possível abrir o arquivo")
     
     def extrair_metadados_todos(self):
         """Extrai metadados de todos os arquivos automaticamente"""
@@ -2817,48 +4266,104 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         messagebox.showinfo("Sucesso", "Metadados extraídos de todos os arquivos!")
     
     def consultar_api_selecionados(self):
-        """Consulta API para os arquivos selecionados"""
+        """Consulta API para os arquivos selecionados.
+
+        As consultas rodam numa thread; a janela aplica cada resultado pela
+        fila assim que ele chega.
+        """
+        if self._processando:
+            return
         selection = self.tree.selection()
         if not selection:
             messagebox.showwarning("Aviso", "Selecione pelo menos um arquivo")
             return
         
         api_key = get_config_value(self.config, 'API', 'google_books_key', '')
-        success_count = 0
         
+        consultas = []
         for item_id in selection:
             item = self.tree.item(item_id)
-            filename = item['values'][0]
+            filename = item_id
             
             # Encontrar arquivo
-            for arquivo in self.arquivos:
-                if arquivo['filename'] == filename:
-                    # Usar título atual (editado ou original) para pesquisa
-                    titulo_pesquisa = item['values'][1]  # Coluna do título
-                    
-                    # Consultar API
-                    resultado = buscar_metadados_inteligente(titulo_pesquisa, None, api_key)
-                    
-                    if resultado:
-                        # Atualizar dados
-                        if filename not in self.dados_editados:
-                            self.dados_editados[filename] = {
-                                'titulo': arquivo['titulo'],
-                                'autor': arquivo['autor'],
-                                'ano': arquivo['ano']
-                            }
-                        
-                        self.dados_editados[filename].update({
-                            'titulo': resultado.get('title', self.dados_editados[filename]['titulo']),
-                            'autor': ', '.join(resultado.get('authors', [self.dados_editados[filename]['autor']])),
-                            'ano': resultado.get('publishedDate', self.dados_editados[filename]['ano'])
-                        })
-                        success_count += 1
+            arquivo = self.by_filename.get(filename)
+            if arquivo is not None:
+                # Usar título atual (editado ou original) para pesquisa
+                titulo_pesquisa = item['values'][1]  # Coluna do título
+                consultas.append((filename, titulo_pesquisa))
+        
+        self._processando = True
+        self._definir_controles(False)
+        fila = queue.Queue()
+        threading.Thread(target=self._consultar_api_worker, args=(consultas, api_key, fila), daemon=True).start()
+        resumo = {'total': len(selection), 'feitos': 0, 'sucesso': 0, 'erros': 0}
+        self.after(100, self._drenar_consulta_api, fila, resumo)
+    
+    def _consultar_api_worker(self, consultas, api_key, fila):
+        """Consulta todos ao mesmo tempo fora da thread do Tk (o limite por host fica com http_get)"""
+        try:
+            if not consultas:
+                return
+            with ThreadPoolExecutor(max_workers=max(1, min(PIPELINE_WORKERS, len(consultas)))) as pool:
+                futures = {pool.submit(buscar_metadados_inteligente, titulo, None, api_key): filename
+                           for filename, titulo in consultas}
+                for future in as_completed(futures):
+                    filename = futures[future]
+                    try:
+                        fila.put(('item', filename, future.result()))
+                    except Exception as e:
+                        print(f"Erro ao consultar API para {filename}: {e}")
+                        fila.put(('erro', filename, None))
+        finally:
+            fila.put(('fim', None, None))
+    
+    def _drenar_consulta_api(self, fila, resumo):
+        """Aplica na janela os resultados já prontos da consulta em andamento"""
+        if not self.winfo_exists():
+            return  # janela fechada: a thread termina sozinha
+        fim = False
+        try:
+            while True:
+                kind, filename, resultado = fila.get_nowait()
+                if kind == 'fim':
+                    fim = True
                     break
+                resumo['feitos'] += 1
+                if kind == 'erro':
+                    resumo['erros'] += 1
+                    continue
+                arquivo = self.by_filename.get(filename)
+                if resultado and arquivo is not None:
+                    # Atualizar dados
+                    if filename not in self.dados_editados:
+                        self.dados_editados[filename] = {
+                            'titulo': arquivo['titulo'],
+                            'autor': arquivo['autor'],
+                            'ano': arquivo['ano']
+                        }
+                    
+                    self.dados_editados[filename].update({
+                        'titulo': resultado.get('title', self.dados_editados[filename]['titulo']),
+                        'autor': ', '.join(resultado.get('authors', [self.dados_editados[filename]['autor']])),
+                        'ano': resultado.get('publishedDate', self.dados_editados[filename]['ano'])
+                    })
+                    resumo['sucesso'] += 1
+        except queue.Empty:
+            pass
         
+        if not fim:
+            self.contador_var.set(f"⏳ Consultando API {resumo['feitos']}/{resumo['total']} arquivo(s)...")
+            self.after(100, self._drenar_consulta_api, fila, resumo)
+            return
+        
+        self._processando = False
+        self._definir_controles(True)
         self.atualizar_lista()
         self.atualizar_contador()
-        messagebox.showinfo("API", f"Consulta concluída: {success_count} de {len(selection)} arquivos encontrados")
+        mensagem = f"Consulta concluída: {resumo['sucesso']} de {resumo['total']} arquivos encontrados"
+        if resumo['erros']:
+            mensagem += f"\n{resumo['erros']} consulta(s) com erro"
+        messagebox.showinfo("API", mensagem)
     
     def processar_selecionados(self):
         """Processa os arquivos selecionados"""
@@ -2868,9 +4373,7 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
             return
         
         arquivos_processar = []
-        for item_id in selection:
-            item = self.tree.item(item_id)
-            filename = item['values'][0]
+        for filename in selection:
             if filename in self.dados_editados:
                 arquivos_processar.append((filename, self.dados_editados[filename]))
         
@@ -2885,21 +4388,22 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         self.processar_arquivos(list(self.dados_editados.items()))
     
     def processar_arquivos(self, arquivos):
-        """Processa os arquivos com os metadados editados"""
-        if not arquivos:
+        """Processa os arquivos com os metadados editados.
+
+        As movimentações rodam numa thread; a janela acompanha o progresso
+        pela fila e atualiza a lista quando o lote termina.
+        """
+        if not arquivos or self._processando:
             return
             
-        success_count = 0
         error_count = 0
+        opts = ProcessOptions.from_config(load_config(), self.base_dir)
         
+        tarefas = []
         for filename, metadados in arquivos:
             try:
                 # Encontrar o arquivo original
-                arquivo_info = None
-                for arquivo in self.arquivos:
-                    if arquivo['filename'] == filename:
-                        arquivo_info = arquivo
-                        break
+                arquivo_info = self.by_filename.get(filename)
                 
                 if not arquivo_info:
                     continue
@@ -2911,26 +4415,80 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
                     'publishedDate': metadados['ano'],
                     'fonte': 'Editor Manual'
                 }
-                
-                # Usar a função process_file simplificada
-                result = self.processar_arquivo_individual(
-                    arquivo_info['full_path'],
-                    meta_para_processar
-                )
-                
-                if result and result['status'] == 'success':
-                    success_count += 1
-                    # Remover da lista atual
-                    self.arquivos.remove(arquivo_info)
-                    if filename in self.dados_editados:
-                        del self.dados_editados[filename]
-                else:
-                    error_count += 1
+                tarefas.append((filename, arquivo_info['full_path'], meta_para_processar))
                     
             except Exception as e:
                 print(f"Erro ao processar {filename}: {e}")
                 error_count += 1
         
+        self._processando = True
+        self._definir_controles(False)
+        fila = queue.Queue()
+        threading.Thread(target=self._processar_worker, args=(tarefas, opts, fila), daemon=True).start()
+        resumo = {'total': len(tarefas), 'feitos': 0, 'sucesso': 0, 'erros': error_count, 'processados': set()}
+        self.after(100, self._drenar_processamento, fila, resumo)
+    
+    def _definir_controles(self, ativos):
+        """Habilita/desabilita os botões (menos Fechar) enquanto o lote é movido ou consultado"""
+        if not ativos and self.editing_item:
+            self.finalizar_edicao()
+        estado = ['!disabled'] if ativos else ['disabled']
+        for frame in (self.button_frame1, self.button_frame2):
+            for botao in frame.winfo_children():
+                if botao is not self.botao_fechar:
+                    botao.state(estado)
+    
+    def _processar_worker(self, tarefas, opts, fila):
+        """Move os arquivos fora da thread do Tk; cada resultado vai para a fila"""
+        try:
+            for filename, filepath, meta in tarefas:
+                try:
+                    # Usar a função process_file simplificada
+                    result = self.processar_arquivo_individual(filepath, meta, opts)
+                    ok = bool(result and result['status'] == 'success')
+                except Exception as e:
+                    print(f"Erro ao processar {filename}: {e}")
+                    ok = False
+                fila.put(('item', filename, ok))
+        finally:
+            fila.put(('fim', None, None))
+    
+    def _drenar_processamento(self, fila, resumo):
+        """Aplica na janela os resultados já prontos do processamento em andamento"""
+        if not self.winfo_exists():
+            return  # janela fechada: a thread termina sozinha
+        fim = False
+        try:
+            while True:
+                kind, filename, ok = fila.get_nowait()
+                if kind == 'fim':
+                    fim = True
+                    break
+                resumo['feitos'] += 1
+                if ok:
+                    resumo['sucesso'] += 1
+                    # Remover da lista atual (ao final, de uma vez)
+                    resumo['processados'].add(filename)
+                    if filename in self.dados_editados:
+                        del self.dados_editados[filename]
+                else:
+                    resumo['erros'] += 1
+        except queue.Empty:
+            pass
+        
+        if not fim:
+            self.contador_var.set(f"⏳ Processando {resumo['feitos']}/{resumo['total']} arquivo(s)...")
+            self.after(100, self._drenar_processamento, fila, resumo)
+            return
+        
+        self._processando = False
+        self._definir_controles(True)
+        processados = resumo['processados']
+        if processados:
+            self.arquivos = [a for a in self.arquivos if a['filename'] not in processados]
+            for filename in processados:
+                self.by_filename.pop(filename, None)
+        
         # Atualizar interface
         self.atualizar_lista()
         self.atualizar_contador()
@@ -2938,20 +4496,20 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
         messagebox.showinfo(
             "Processamento Concluído",
             f"Arquivos processados:\n"
-            f"✅ Sucesso: {success_count}\n"
-            f"❌ Erros: {error_count}"
+            f"✅ Sucesso: {resumo['sucesso']}\n"
+            f"❌ Erros: {resumo['erros']}"
         )
 
-    def processar_arquivo_individual(self, filepath, metadata):
+    def processar_arquivo_individual(self, filepath, metadata, opts=None):
         """Processa um arquivo individual com metadados pré-definidos"""
         try:
-            config = load_config()
-            out_base = self.base_dir
-            organize_mode = get_config_value(config, 'Geral', 'organize_mode', 'autor')
-            pattern = get_config_value(config, 'Geral', 'filename_pattern', '{author} - {title} ({year})')
-            download_covers = get_config_value(config, 'Opcoes', 'baixar_capas', 'True').lower() == 'true'
-            remover_acentos = get_config_value(config, 'Opcoes', 'remover_acentos', 'True').lower() == 'true'
-            limpar_caracteres = get_config_value(config, 'Opcoes', 'limpar_caracteres', 'True').lower() == 'true'
+            if opts is None:
+                opts = ProcessOptions.from_config(load_config(), self.base_dir)
+            out_base = opts.out_base
+            organize_mode = opts.organize_mode
+            pattern = opts.pattern
+            remover_acentos = opts.remover_acentos
+            limpar_caracteres = opts.limpar_caracteres
             
             # Aplicar normalizações
             meta = apply_text_normalization(metadata, remover_acentos, limpar_caracteres)
@@ -2960,8 +4518,9 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
             author = choose_primary_author(meta.get('authors')) if meta.get('authors') else "Autor Desconhecido"
             genre = choose_primary_genre(meta.get('categories')) if meta.get('categories') else "Geral"
             year = year_from_date_str(meta.get('publishedDate')) or "s.d."
-            title = meta.get('title') or os.path.splitext(os.path.basename(filepath))[0]
-            ext = os.path.splitext(filepath)[1].lower()
+            base, ext = os.path.splitext(os.path.basename(filepath))
+            ext = ext.lower()
+            title = meta.get('title') or base
             
             # Criar diretório de destino
             if organize_mode == 'autor':
@@ -2969,19 +4528,15 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
             else:
                 dest_dir = os.path.join(out_base, sanitize_filename(genre), sanitize_filename(author))
             
-            os.makedirs(dest_dir, exist_ok=True)
+            ensure_dir(dest_dir)
             
             # Construir nome do arquivo
-            dest_name = build_filename({
-                'authors': [author],
-                'title': title,
-                'publishedDate': year
-            }, ext, pattern=pattern)
+            dest_name = build_filename({'title': title}, ext, pattern=pattern, author=author, year=year)
             
             dest_path = ensure_unique_path(dest_dir, dest_name)
             
             # Mover arquivo
-            shutil.move(filepath, dest_path)
+            move_path(filepath, dest_path)
             
             return {'status': 'success', 'path': dest_path}
             
@@ -3016,6 +4571,11 @@ class GerenciadorNaoLocalizados(tk.Toplevel):
 
 
 # === Interface Tkinter ===
+# Linhas mantidas no widget de log; as mais antigas são descartadas
+LOG_MAX_LINES = 5000
+# Intervalo de leitura da fila do worker; a leitura só roda enquanto ele está ativo
+QUEUE_POLL_MS = 50
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -3036,6 +4596,7 @@ class App(tk.Tk):
         self.remover_acentos_var = tk.BooleanVar(value=get_config_value(self.config, 'Opcoes', 'remover_acentos', 'True').lower() == 'true')
         self.limpar_caracteres_var = tk.BooleanVar(value=get_config_value(self.config, 'Opcoes', 'limpar_caracteres', 'True').lower() == 'true')
         self.ignorar_sem_meta_var = tk.BooleanVar(value=get_config_value(self.config, 'Opcoes', 'ignorar_sem_metadados', 'False').lower() == 'true')
+        self.detectar_duplicados_var = tk.BooleanVar(value=get_config_value(self.config, 'Opcoes', 'detectar_duplicados', 'False').lower() == 'true')
         
         # No __init__ da classe App
         self.isbndb_key_var = tk.StringVar(value=get_config_value(self.config, 'API', 'isbndb_key', ''))
@@ -3047,6 +4608,8 @@ class App(tk.Tk):
         self.stop_flag = threading.Event()
         self.total_files = 0
         self.processed_files = 0
+        self._worker_thread = None
+        self._stats_cache = None  # ((pasta, mtime_ns), contagem) de show_stats
 
         self.create_widgets()
         
@@ -3092,6 +4655,7 @@ class App(tk.Tk):
         ttk.Checkbutton(row5, text="Remover acentos", variable=self.remover_acentos_var).pack(side='left')
         ttk.Checkbutton(row5, text="Limpar caracteres especiais", variable=self.limpar_caracteres_var).pack(side='left', padx=10)
         ttk.Checkbutton(row5, text="Ignorar sem metadados", variable=self.ignorar_sem_meta_var).pack(side='left')
+        ttk.Checkbutton(row5, text="Mover cópias idênticas para Duplicados", variable=self.detectar_duplicados_var).pack(side='left', padx=10)
 
         # Linha 6: Capas e API
         row6 = ttk.Frame(frm)
@@ -3148,6 +4712,7 @@ class App(tk.Tk):
         self.config.set('Opcoes', 'remover_acentos', str(self.remover_acentos_var.get()))
         self.config.set('Opcoes', 'limpar_caracteres', str(self.limpar_caracteres_var.get()))
         self.config.set('Opcoes', 'ignorar_sem_metadados', str(self.ignorar_sem_meta_var.get()))
+        self.config.set('Opcoes', 'detectar_duplicados', str(self.detectar_duplicados_var.get()))
         self.config.set('API', 'google_books_key', self.key_var.get())
         
         save_config(self.config)
@@ -3170,6 +4735,7 @@ class App(tk.Tk):
             self.remover_acentos_var.set(True)
             self.limpar_caracteres_var.set(True)
             self.ignorar_sem_meta_var.set(False)
+            self.detectar_duplicados_var.set(False)
             
             self.log_line("✓ Configurações resetadas para padrão!", "success")
     
@@ -3251,8 +4817,19 @@ class App(tk.Tk):
             unknown_dir = get_config_value(self.config, 'Geral', 'unknown_dirname', '2. Não Localizados')
             unknown_path = os.path.join(self.dst_var.get(), unknown_dir)
             
-            if os.path.exists(unknown_path):
-                count = len([f for f in os.listdir(unknown_path) if os.path.isfile(os.path.join(unknown_path, f))])
+            try:
+                st = os.stat(unknown_path)
+            except OSError:
+                st = None
+            if st is not None:
+                # Contagem refeita só quando a pasta muda (entrada/saída de arquivos altera o mtime)
+                key = (unknown_path, st.st_mtime_ns)
+                if self._stats_cache is not None and self._stats_cache[0] == key:
+                    count = self._stats_cache[1]
+                else:
+                    with os.scandir(unknown_path) as it:
+                        count = sum(1 for e in it if e.is_file() and not e.name.startswith(UNKNOWN_META_CACHE))
+                    self._stats_cache = (key, count)
                 messagebox.showinfo("Estatísticas", f"Arquivos não localizados: {count}")
             else:
                 messagebox.showinfo("Estatísticas", "Pasta de não localizados não existe")
@@ -3292,12 +4869,7 @@ class App(tk.Tk):
         self.stop_flag.clear()
         self.processed_files = 0
 
-        files = []
-        for root, _, fnames in os.walk(src):
-            for fn in fnames:
-                ext = os.path.splitext(fn)[1].lower()
-                if ext in SUPPORTED_EXTS:
-                    files.append(os.path.join(root, fn))
+        files = list(iter_book_files(src))
         if not files:
             messagebox.showinfo("Nada a fazer", "Nenhum arquivo suportado encontrado.")
             return
@@ -3309,8 +4881,9 @@ class App(tk.Tk):
         self.log_line("", "info")
 
         t = threading.Thread(target=self.worker, args=(files,), daemon=True)
+        self._worker_thread = t
         t.start()
-        self.after(200, self.drain_queue)
+        self.after(QUEUE_POLL_MS, self.drain_queue)
     
     def stop_processing(self):
         self.stop_flag.set()
@@ -3323,15 +4896,16 @@ class App(tk.Tk):
         def log_wrapper(text: str, tag: str = ""):
             self.queue.put(("log", (text, tag)))
         
-        config = load_config()
+        # Configuração já carregada na janela (save_all_config/reset_config a mantêm atual)
+        config = self.config
         out_base = self.dst_var.get().strip()
         mode = self.mode_var.get()
         pattern = self.pattern_var.get()
         covers = self.covers_var.get()
         api_key = self.key_var.get().strip() or None
-        lang = self.lang_var.get().strip() or None
         remover_acentos_flag = self.remover_acentos_var.get()
         limpar_caracteres_flag = self.limpar_caracteres_var.get()
+        detectar_duplicados_flag = self.detectar_duplicados_var.get()
 
         # Usar nomes de pastas da configuração
         log_dirname = get_config_value(config, 'Geral', 'log_dirname', '1. logs')
@@ -3339,103 +4913,141 @@ class App(tk.Tk):
         duplicates_dirname = get_config_value(config, 'Geral', 'duplicates_dirname', '3. Duplicados')
         covers_dirname = get_config_value(config, 'Geral', 'covers_dirname', 'covers')
 
+        # Pastas podem ter sido apagadas desde a última execução
+        _CREATED_DIRS.clear()
+
         # Criar pastas especiais
-        os.makedirs(os.path.join(out_base, log_dirname), exist_ok=True)
-        os.makedirs(os.path.join(out_base, unknown_dirname), exist_ok=True)
-        os.makedirs(os.path.join(out_base, duplicates_dirname), exist_ok=True)
+        log_dir = ensure_dir(os.path.join(out_base, log_dirname))
+        ensure_dir(os.path.join(out_base, unknown_dirname))
+        ensure_dir(os.path.join(out_base, duplicates_dirname))
 
         # Preparar logs CSV
-        log_dir = os.path.join(out_base, log_dirname)
         actions_csv = os.path.join(log_dir, "organizacao_log.csv")
         index_csv = os.path.join(log_dir, "biblioteca_index.csv")
 
-        actions: List[ActionLog] = []
-        library_rows: List[List[str]] = []
-
-        # Filtrar arquivos que ainda existem (não foram processados anteriormente)
-        existing_files = [f for f in files if os.path.exists(f)]
-        
-        if len(existing_files) != len(files):
-            log_wrapper(f"AVISO: {len(files) - len(existing_files)} arquivos já foram processados anteriormente", "warning")
+        # CSVs gravados à medida que os arquivos são tratados: memória constante
+        # e log parcial preservado se o processamento for cancelado ou falhar
+        csvs = contextlib.ExitStack()
+        actions_w = open_csv_log(csvs, actions_csv, ACTION_LOG_FIELDS, "log de ações", log_wrapper)
+        index_w = open_csv_log(csvs, index_csv, INDEX_CSV_FIELDS, "índice", log_wrapper)
 
-        for i, path in enumerate(existing_files, 1):
-            if self.stop_flag.is_set():
-                log_wrapper("⏹ Processamento cancelado pelo usuário", "warning")
-                break
+        def registrar(alog: ActionLog, indexar: bool = False):
+            """Grava a ação (e a linha do índice, se organizado) no CSV"""
             try:
-                alog = process_file(
-                    path=path,
-                    out_base=out_base,
-                    organize_mode=mode,
-                    pattern=pattern,
-                    download_covers=covers,
-                    api_key=api_key,
-                    lang_restrict=lang,
-                    remover_acentos_flag=remover_acentos_flag,
-                    limpar_caracteres_flag=limpar_caracteres_flag,
-                    logfn=log_wrapper,  # Usar a wrapper function
-                )
-                actions.append(alog)
-                library_rows.append([
-                    alog.title,
-                    alog.author,
-                    alog.year,
-                    alog.genre,
-                    os.path.relpath(alog.dest_path, out_base) if alog.dest_path else '',
-                    os.path.relpath(alog.cover_path, out_base) if alog.cover_path else '',
-                    alog.fonte
-                ])
+                if actions_w is not None:
+                    actions_w.writerow(action_log_row(alog))
+                if indexar and index_w is not None:
+                    index_w.writerow((
+                        alog.title,
+                        alog.author,
+                        alog.year,
+                        alog.genre,
+                        relpath_under(alog.dest_path, out_base),
+                        relpath_under(alog.cover_path, out_base),
+                        alog.fonte
+                    ))
             except Exception as e:
-                error_msg = f"ERRO CRÍTICO: Falha inesperada com '{os.path.basename(path)}': {str(e)}"
-                log_wrapper(error_msg, "error")
-                print(traceback.format_exc())
-
-            # Atualizar progresso
-            self.processed_files = i
-            self.queue.put(("progress", i))
-
-        # Gravar CSVs
-        try:
-            with open(actions_csv, 'w', newline='', encoding='utf-8-sig') as f:
-                w = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
-                w.writerow(["source_path", "dest_path", "title", "author", "year", "genre", "cover_path", "status", "note", "fonte"])
-                for a in actions:
-                    w.writerow([
-                        a.source_path, a.dest_path, a.title, a.author, a.year, a.genre, 
-                        a.cover_path, a.status, a.note, a.fonte
-                    ])
-            self.queue.put(("log", (f"✓ Log de ações salvo: {actions_csv}", "success")))
-        except Exception as e:
-            self.queue.put(("log", (f"ERRO: Ao salvar log de ações: {e}", "error")))
+                log_wrapper(f"ERRO: Ao gravar CSV de log: {e}", "error")
 
         try:
-            with open(index_csv, 'w', newline='', encoding='utf-8-sig') as f:
-                w = csv.writer(f, delimiter=';', quoting=csv.QUOTE_ALL)
-                w.writerow(["title", "author", "year", "genre", "relative_path", "cover_relpath", "fonte"])
-                for row in library_rows:
-                    w.writerow(row)
-            self.queue.put(("log", (f"✓ Índice da biblioteca salvo: {index_csv}", "success")))
-        except Exception as e:
-            self.queue.put(("log", (f"ERRO: Ao salvar índice: {e}", "error")))
+            # Filtrar arquivos que ainda existem (não foram processados anteriormente)
+            existing_files = [f for f in files if os.path.exists(f)]
+        
+            if len(existing_files) != len(files):
+                log_wrapper(f"AVISO: {len(files) - len(existing_files)} arquivos já foram processados anteriormente", "warning")
+
+            # Cópias idênticas vão direto para duplicados, sem consultar APIs
+            done = 0
+            if detectar_duplicados_flag:
+                duplicados = find_duplicate_files(existing_files)
+                if duplicados:
+                    log_wrapper(f"{len(duplicados)} arquivo(s) com conteúdo repetido", "info")
+                    for dup, original in duplicados.items():
+                        if self.stop_flag.is_set():
+                            break
+                        registrar(move_to_duplicates(dup, original, out_base, duplicates_dirname, log_wrapper))
+                        done += 1
+                        self.queue.put(("progress", done))
+                    existing_files = [f for f in existing_files if f not in duplicados]
+
+            # Autores com vários livros no lote: catálogo por autor baixado sob demanda (_author_catalog)
+            prepare_author_catalogs(existing_files)
+            # Threads de identificação: ajustável em [Geral] workers (ex.: limite de cota das APIs)
+            try:
+                workers = max(1, int(get_config_value(config, 'Geral', 'workers', str(PIPELINE_WORKERS))))
+            except ValueError:
+                workers = PIPELINE_WORKERS
+            identified = identify_files_parallel(existing_files, api_key, self.stop_flag, max_workers=workers)
+            for i, (path, meta, lines, error) in enumerate(identified, done + 1):
+                if self.stop_flag.is_set():
+                    log_wrapper("⏹ Processamento cancelado pelo usuário", "warning")
+                    identified.close()
+                    break
+                for text, tag in lines:
+                    log_wrapper(text, tag)
+                try:
+                    if error:
+                        raise error
+                    alog = organize_identified_file(
+                        path=path,
+                        meta=meta,
+                        out_base=out_base,
+                        organize_mode=mode,
+                        pattern=pattern,
+                        download_covers=covers,
+                        remover_acentos_flag=remover_acentos_flag,
+                        limpar_caracteres_flag=limpar_caracteres_flag,
+                        logfn=log_wrapper,  # Usar a wrapper function
+                    )
+                    registrar(alog, indexar=True)
+                except Exception as e:
+                    error_msg = f"ERRO CRÍTICO: Falha inesperada com '{os.path.basename(path)}': {str(e)}"
+                    log_wrapper(error_msg, "error")
+                    print(''.join(traceback.format_exception(type(e), e, e.__traceback__)))
+
+                # Atualizar progresso
+                self.processed_files = i
+                self.queue.put(("progress", i))
+        finally:
+            try:
+                csvs.close()  # descarrega o buffer dos CSVs
+                if actions_w is not None:
+                    log_wrapper(f"✓ Log de ações salvo: {actions_csv}", "success")
+                if index_w is not None:
+                    log_wrapper(f"✓ Índice da biblioteca salvo: {index_csv}", "success")
+            except Exception as e:
+                log_wrapper(f"ERRO: Ao salvar logs CSV: {e}", "error")
 
         self.queue.put(("done", None))
     
     def drain_queue(self):
+        # Linhas e progresso acumulados e aplicados uma vez por ciclo:
+        # uma só inserção no Text em vez de uma por mensagem
+        linhas = []
+        progresso = None
+        concluido = False
         try:
             while True:
                 kind, payload = self.queue.get_nowait()
                 if kind == 'progress':
-                    self.progress.configure(value=payload)
+                    progresso = payload
                 elif kind == 'log':
-                    text, tag = payload
-                    self.append_log(text, tag)
+                    linhas.append(payload)
                 elif kind == 'done':
-                    self.progress.configure(value=self.total_files)
-                    self.log_line("✅ Processamento concluído!", "success")
+                    progresso = self.total_files
+                    linhas.append(("✅ Processamento concluído!", "success"))
+                    concluido = True
         except queue.Empty:
             pass
-        if not self.stop_flag.is_set() and self.processed_files < self.total_files:
-            self.after(200, self.drain_queue)
+        if progresso is not None:
+            self.progress.configure(value=progresso)
+        if linhas:
+            self.append_logs(linhas)
+        # Continua até o "done" do worker (as mensagens finais, como a gravação
+        # dos CSVs e o cancelamento, chegam depois do último arquivo); para
+        # também se a thread morreu sem enviá-lo
+        if not concluido and (self._worker_thread.is_alive() or not self.queue.empty()):
+            self.after(QUEUE_POLL_MS, self.drain_queue)
     
     def append_log(self, text: str, tag: str = ""):
         """Adiciona texto ao widget de log"""
@@ -3450,6 +5062,24 @@ class App(tk.Tk):
         except Exception as e:
             print(f"Erro no append_log: {e} - Texto: {text}")
     
+    def append_logs(self, linhas):
+        """Adiciona várias linhas (texto, tag) ao log numa única inserção, na ordem"""
+        try:
+            # Text.insert aceita pares texto/tags em sequência
+            args = []
+            for text, tag in linhas:
+                args.append(text + "\n")
+                args.append(tag or ())
+            self.log.configure(state='normal')
+            self.log.insert('end', *args)
+            excesso = int(self.log.index('end-1c').split('.')[0]) - 1 - LOG_MAX_LINES
+            if excesso > 0:
+                self.log.delete('1.0', f'{excesso + 1}.0')
+            self.log.see('end')
+            self.log.configure(state='disabled')
+        except Exception as e:
+            print(f"Erro no append_logs: {e}")
+    
     def clear_log(self):
         """Limpa o widget de log"""
         try:
@@ -3473,5 +5103,6 @@ class App(tk.Tk):
 #       self.queue.put(("log", (formatted_text, tag)))
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # executável congelado no Windows (pool de processos)
     app = App()
     app.mainloop()